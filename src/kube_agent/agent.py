@@ -7,10 +7,12 @@ LLM, Kubernetes, Gitea 작업을 조율하는 에이전트 메인 루프입니
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+from collections import deque
 from typing import Any
 
+import httpx
+import orjson
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import InMemoryHistory
 
@@ -20,10 +22,34 @@ from kube_agent.file_ops import FileOps
 from kube_agent.gitea_ops import GiteaOps
 from kube_agent.kubernetes_ops import KubernetesOps
 from kube_agent.llm import SYSTEM_PROMPT, LLMClient
-from kube_agent.tools import TOOLS, execute_tool
+from kube_agent.tools import READ_ONLY_TOOLS, TOOLS, build_dispatch_table, execute_tool
 
 logger = logging.getLogger(__name__)
 
+# LLM 페이로드에 전문을 그대로 포함할 최근 도구 결과 수.
+# 이보다 오래된 도구 결과는 생략 마커로 치환되어 프롬프트 크기를 줄입니다.
+_TOOL_RESULT_LIVE_WINDOW = 4
+
+
+def _strip_assistant(response: dict[str, Any]) -> dict[str, Any]:
+    """assistant 응답에서 LLM에 다시 보낼 필드만 남깁니다.
+
+    백엔드에 따라 응답에 usage/id 등 에코백이 불필요한 메타데이터가
+    섞일 수 있고, 빈 content도 프롬프트 바이트만 차지하므로 제거합니다.
+
+    Args:
+        response: LLM 응답 딕셔너리
+
+    Returns:
+        role/content/tool_calls만 포함한 새 딕셔너리
+    """
+    stripped: dict[str, Any] = {"role": "assistant"}
+    if content := response.get("content"):
+        stripped["content"] = content
+    if tool_calls := response.get("tool_calls"):
+        stripped["tool_calls"] = tool_calls
+    return stripped
+
 
 class Agent:
     """Kubernetes/Gitea 관리를 위한 대화형 AI 에이전트.
@@ -39,7 +65,19 @@ class Agent:
             config: 에이전트 설정 (LLM, K8s, Gitea 연결 정보 포함)
         """
         self._config = config
-        self._llm = LLMClient(config)
+        # LLM과 Gitea가 하나의 커넥션 풀(TLS 세션 포함)을 공유하도록
+        # httpx 클라이언트를 에이전트 수준에서 관리합니다.
+        self._http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=60.0,
+            ),
+            timeout=config.gitea_timeout,
+        )
+        self._llm = LLMClient(config, client=self._http)
+        self._llm.set_tools(TOOLS)
         self._k8s = KubernetesOps(
             namespace=config.kube_namespace,
             context=config.kube_context,
@@ -48,23 +86,57 @@ class Agent:
             gitea_url=config.gitea_url,
             token=config.gitea_token,
             timeout=config.gitea_timeout,
+            client=self._http,
         )
         self._files = FileOps()
-        self._messages: list[dict[str, Any]] = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-        ]
-
-    def _trim_messages(self) -> None:
-        """메시지 히스토리가 너무 길면 오래된 메시지를 제거합니다.
-
-        시스템 프롬프트는 항상 유지하고, 나머지 메시지 중
-        오래된 것부터 제거하여 max_messages 이하로 유지합니다.
+        # ops 인스턴스는 세션 고정이므로 바인딩된 디스패치 테이블을 한 번만 생성
+        self._dispatch_table = build_dispatch_table(self._k8s, self._gitea, self._files)
+        # 시스템 프롬프트는 별도 슬롯에 보관하고, 나머지 히스토리는
+        # maxlen 데크로 관리하여 append 시 오래된 메시지가 O(1)로 자동 제거됩니다.
+        self._system: dict[str, Any] = {"role": "system", "content": SYSTEM_PROMPT}
+        self._history: deque[dict[str, Any]] = deque(maxlen=max(config.max_messages - 1, 1))
+        # 직전 _chat 호출에서 텍스트가 이미 스트리밍 렌더링되었는지 여부
+        self._last_stream_rendered = False
+
+    def _build_messages(self) -> list[dict[str, Any]]:
+        """LLM에 전달할 메시지 리스트를 구성합니다 (시스템 프롬프트 + 히스토리).
+
+        최근 _TOOL_RESULT_LIVE_WINDOW개를 제외한 오래된 도구 결과는
+        생략 마커로 치환하여 매 요청마다 재전송되는 바이트를 줄입니다.
+        히스토리 원본(self._history)은 수정하지 않습니다.
+        """
+        history = list(self._history)
+        tool_indices = [i for i, m in enumerate(history) if m.get("role") == "tool"]
+        stale = set(tool_indices[:-_TOOL_RESULT_LIVE_WINDOW])
+
+        # messages[0]은 항상 동일한 self._system 객체여야 합니다.
+        # 시스템 프롬프트가 바이트 단위로 동일해야 vLLM 등 백엔드의
+        # 프리픽스 KV 캐시가 매 호출 적중합니다 (사본 생성·공백 변형 금지).
+        messages: list[dict[str, Any]] = [self._system]
+        for i, msg in enumerate(history):
+            if i in stale:
+                content = msg.get("content", "")
+                msg = {
+                    **msg,
+                    "content": f"[이전 도구 결과 생략 — {len(content):,} chars. "
+                    "다시 필요하면 해당 도구를 재호출하세요.]",
+                }
+            messages.append(msg)
+        return messages
+
+    async def _chat(self) -> dict[str, Any]:
+        """현재 히스토리로 LLM을 스트리밍 호출하고 응답을 반환합니다.
+
+        텍스트 델타는 도착 즉시 터미널에 렌더링되며,
+        렌더링 여부는 _last_stream_rendered에 기록됩니다.
         """
-        max_messages = self._config.max_messages
-        if len(self._messages) > max_messages:
-            # 시스템 프롬프트(첫 번째)는 유지
-            system = self._messages[0]
-            self._messages = [system] + self._messages[-(max_messages - 1) :]
+        with cli.stream_agent_response() as feed:
+            response = await self._llm.chat_stream(
+                messages=self._build_messages(),
+                on_content=feed,
+            )
+        self._last_stream_rendered = feed.streamed
+        return response
 
     async def _process_tool_calls(self, response: dict[str, Any]) -> dict[str, Any]:
         """LLM 응답의 tool_calls를 처리하고 재귀적으로 LLM을 다시 호출합니다.
@@ -79,41 +151,73 @@ class Agent:
         """
         iteration = 0
         current_response = response
+        # 루프 내 반복 조회를 피하기 위해 설정값을 로컬에 바인딩
+        max_iterations = self._config.max_tool_iterations
+        max_chars = self._config.tool_result_max_chars
+
+        # 같은 사용자 턴 안의 동일한 읽기 전용 호출은 한 번만 실행하고
+        # 결과를 공유합니다 (LLM이 뒤 반복에서 같은 list/get을 다시
+        # 요청하는 경우가 흔함). 쓰기 도구가 실행되면 execute_tool이 비웁니다.
+        turn_cache: dict[tuple[str, bytes], str] = {}
 
-        while "tool_calls" in current_response and iteration < self._config.max_tool_iterations:
+        while "tool_calls" in current_response and iteration < max_iterations:
             iteration += 1
             tool_calls = current_response["tool_calls"]
 
-            # assistant 메시지를 히스토리에 추가 (tool_calls 포함)
-            self._messages.append(current_response)
+            # assistant 메시지를 히스토리에 추가 (tool_calls 포함, 메타데이터 제거)
+            self._history.append(_strip_assistant(current_response))
 
+            # 인자를 먼저 모두 파싱한 뒤, 독립적인 도구 호출을 동시에 실행합니다.
+            # (wall-clock이 sum(latency)가 아닌 max(latency)로 줄어듭니다)
+            parsed: list[tuple[str, str, dict[str, Any]]] = []
             for tc in tool_calls:
                 func = tc.get("function", {})
                 tool_name = func.get("name", "unknown")
                 tool_id = tc.get("id", "")
 
-                # 인자 파싱
                 raw_args = func.get("arguments", "{}")
                 try:
-                    arguments = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
-                except json.JSONDecodeError:
+                    arguments = orjson.loads(raw_args) if isinstance(raw_args, (str, bytes)) else raw_args
+                except ValueError:
                     arguments = {}
 
                 cli.print_tool_call(tool_name)
-
-                # 도구 실행
-                result = await execute_tool(
-                    tool_name=tool_name,
-                    arguments=arguments,
-                    k8s=self._k8s,
-                    gitea=self._gitea,
-                    files=self._files,
+                parsed.append((tool_name, tool_id, arguments))
+
+            # 같은 배치 안의 중복 읽기 전용 호출은 코루틴 생성 전에 접습니다
+            coros = []
+            indices: list[int] = []
+            dedup: dict[tuple[str, bytes], int] = {}
+            for tool_name, _, arguments in parsed:
+                key = (tool_name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS))
+                if tool_name in READ_ONLY_TOOLS and key in dedup:
+                    indices.append(dedup[key])
+                    continue
+                dedup[key] = len(coros)
+                indices.append(len(coros))
+                coros.append(
+                    execute_tool(
+                        tool_name=tool_name,
+                        arguments=arguments,
+                        k8s=self._k8s,
+                        gitea=self._gitea,
+                        files=self._files,
+                        turn_cache=turn_cache,
+                        table=self._dispatch_table,
+                    )
                 )
 
-                cli.print_tool_result(tool_name, result, max_chars=self._config.tool_result_max_chars)
+            gathered = await asyncio.gather(*coros, return_exceptions=True)
+            results = [gathered[i] for i in indices]
+
+            # 원래 호출 순서대로 출력하고 히스토리에 추가하여 결정적으로 유지합니다.
+            for (tool_name, tool_id, _), result in zip(parsed, results):
+                if isinstance(result, BaseException):
+                    result = f"도구 '{tool_name}' 실행 중 오류: {result}"
 
-                # 도구 결과를 메시지에 추가
-                self._messages.append(
+                await cli.aprint_tool_result(tool_name, result, max_chars=max_chars)
+
+                self._history.append(
                     {
                         "role": "tool",
                         "tool_call_id": tool_id,
@@ -122,36 +226,15 @@ class Agent:
                 )
 
             # 도구 결과를 포함하여 LLM 재호출
-            self._trim_messages()
-            current_response = await self._llm.chat(
-                messages=self._messages,
-                tools=TOOLS,
-            )
+            current_response = await self._chat()
 
         return current_response
 
-    @staticmethod
-    def _needs_continuation(response: dict[str, Any]) -> bool:
-        """텍스트 응답(tool_calls 없음)이 왔을 때 계속 진행이 필요한지 판단합니다.
-
-        시스템 프롬프트가 "작업 완료 전까지 텍스트 응답 금지"를 지시하므로,
-        tool_calls 없이 텍스트가 반환된 경우 작업이 완료된 것으로 간주합니다.
-        키워드 휴리스틱은 오탐(false-positive)을 유발하므로 사용하지 않습니다.
-
-        Args:
-            response: LLM 응답 딕셔너리
-
-        Returns:
-            항상 False (텍스트 응답 = 작업 완료)
-        """
-        return False
-
     async def _handle_user_input(self, user_input: str) -> None:
-        """사용자 입력을 처리하고 자율 실행 모드로 LLM 응답을 처리합니다.
+        """사용자 입력을 처리하고 LLM 응답(도구 호출 포함)을 처리합니다.
 
-        LLM이 도구를 호출하는 동안은 자동으로 반복하고,
-        텍스트로 응답하더라도 작업이 완료되지 않았으면
-        자동으로 계속 진행을 요청합니다.
+        시스템 프롬프트가 "작업 완료 전까지 텍스트 응답 금지"를 지시하므로,
+        tool_calls 없이 텍스트가 반환되면 작업이 완료된 것으로 간주합니다.
 
         Args:
             user_input: 사용자가 입력한 텍스트
@@ -159,50 +242,26 @@ class Agent:
         cli.print_user_input(user_input)
 
         # 사용자 메시지 추가
-        self._messages.append({"role": "user", "content": user_input})
-        self._trim_messages()
+        self._history.append({"role": "user", "content": user_input})
 
         cli.print_thinking()
 
-        for round_idx in range(self._config.max_auto_continue + 1):
-            # LLM 호출
-            response = await self._llm.chat(
-                messages=self._messages,
-                tools=TOOLS,
-            )
+        # LLM 호출
+        response = await self._chat()
 
-            # tool_calls가 있으면 모두 처리한 후 최종 응답 받음
-            if "tool_calls" in response:
-                response = await self._process_tool_calls(response)
-
-            # 텍스트 응답 표시
-            content = response.get("content", "")
-            if content:
-                cli.print_agent_response(content)
-                self._messages.append({"role": "assistant", "content": content})
-            else:
-                cli.print_info("(no response)")
-                break
-
-            # 자율 실행 최대 횟수 도달
-            if round_idx >= self._config.max_auto_continue:
-                break
-
-            # 작업 완료 여부 판단
-            if not self._needs_continuation(response):
-                break
-
-            # 자동 계속 진행
-            round_num = round_idx + 1
-            cli.print_auto_continue(round_num, self._config.max_auto_continue)
-            self._messages.append({
-                "role": "user",
-                "content": (
-                    "작업을 계속 진행해주세요. 도구를 호출하여 다음 단계를 실행하세요. "
-                    "모든 단계가 완료되면 최종 결과를 요약해주세요."
-                ),
-            })
-            self._trim_messages()
+        # tool_calls가 있으면 모두 처리한 후 최종 응답 받음
+        if "tool_calls" in response:
+            response = await self._process_tool_calls(response)
+
+        # 텍스트 응답 표시
+        content = response.get("content", "")
+        if content:
+            # 스트리밍으로 이미 렌더링된 경우 재출력하지 않음
+            if not self._last_stream_rendered:
+                await cli.aprint_agent_response(content)
+            self._history.append({"role": "assistant", "content": content})
+        else:
+            cli.print_info("(no response)")
 
     async def run(self) -> None:
         """에이전트 메인 루프를 시작합니다.
@@ -222,11 +281,8 @@ class Agent:
         try:
             while True:
                 try:
-                    # prompt_toolkit은 동기 함수이므로 executor에서 실행
-                    user_input = await asyncio.get_running_loop().run_in_executor(
-                        None,
-                        lambda: session.prompt("You: "),
-                    )
+                    # prompt_toolkit 3.x는 asyncio 네이티브이므로 executor 없이 직접 await
+                    user_input = await session.prompt_async("You: ")
 
                     # 빈 입력 무시
                     stripped = user_input.strip()
@@ -256,3 +312,5 @@ class Agent:
                     continue
         finally:
             await self._gitea.close()
+            await self._llm.close()
+            await self._http.aclose()
@@ -6,7 +6,13 @@ prompt_toolkit을 사용한 인터랙티브 입력을 제공합니다.
 
 from __future__ import annotations
 
-from rich.console import Console
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from rich.console import Console, Group
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.text import Text
@@ -28,6 +34,13 @@ _THEME = Theme(
 # 전역 콘솔 인스턴스
 console = Console(theme=_THEME)
 
+# 이 문자가 하나도 없으면 마크다운 파싱 없이 일반 텍스트로 출력합니다.
+_MARKDOWN_CHARS = "`*_#[>"
+
+# 이 길이를 넘는 콘텐츠는 렌더링(마크다운 파싱, 패널 폭 계산)을
+# 워커 스레드로 보내 이벤트 루프를 막지 않습니다.
+_ASYNC_RENDER_THRESHOLD = 2000
+
 
 def print_banner(llm_url: str, namespace: str, gitea_url: str) -> None:
     """에이전트 시작 배너를 출력합니다.
@@ -50,10 +63,9 @@ def print_banner(llm_url: str, namespace: str, gitea_url: str) -> None:
     lines.append("")
     lines.append("[dim]Type your message and press Enter. Ctrl+C to cancel, Ctrl+D to exit.[/dim]")
 
-    console.print()
-    for line in lines:
-        console.print(line)
-    console.print()
+    # console.print는 호출마다 락 획득 + 버퍼 렌더링 + flush를 수행하므로
+    # 한 번의 호출로 묶어서 출력합니다.
+    console.print("\n" + "\n".join(lines) + "\n")
 
 
 def print_user_input(text: str) -> None:
@@ -62,9 +74,7 @@ def print_user_input(text: str) -> None:
     Args:
         text: 사용자가 입력한 텍스트
     """
-    console.print()
-    console.print(Text("You: ", style="user"), end="")
-    console.print(text)
+    console.print(Group(Text(""), Text.assemble(("You: ", "user"), text)))
 
 
 def print_thinking() -> None:
@@ -81,13 +91,59 @@ def print_agent_response(content: str) -> None:
     """
     if not content:
         return
-    console.print()
-    console.print(Text("Agent: ", style="agent"), end="")
-    # 마크다운 렌더링 시도, 실패하면 일반 텍스트
+    # 마크다운 문법이 전혀 없으면 파서(markdown-it)를 거치지 않고 바로 출력
+    if not any(c in content for c in _MARKDOWN_CHARS):
+        body: Any = Text(content)
+    else:
+        # 마크다운 렌더링 시도, 실패하면 일반 텍스트 (출력은 한 번의 print로)
+        try:
+            body = Markdown(content)
+        except Exception:
+            body = content
+    console.print(Group(Text(""), Text("Agent: ", style="agent"), body))
+
+
+class _StreamFeed:
+    """스트리밍 델타를 받아 Live 마크다운으로 점진 렌더링하는 콜백 객체.
+
+    첫 델타가 도착하기 전에는 아무것도 출력하지 않으므로,
+    tool_calls만 있는 응답에서는 화면에 빈 블록이 남지 않습니다.
+    """
+
+    def __init__(self) -> None:
+        self.streamed = False
+        self._buffer: list[str] = []
+        self._live: Live | None = None
+
+    def __call__(self, delta: str) -> None:
+        if self._live is None:
+            console.print()
+            console.print(Text("Agent: ", style="agent"))
+            self._live = Live(console=console, refresh_per_second=8)
+            self._live.start()
+        self.streamed = True
+        self._buffer.append(delta)
+        self._live.update(Markdown("".join(self._buffer)))
+
+    def close(self) -> None:
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+
+@contextmanager
+def stream_agent_response() -> Iterator[_StreamFeed]:
+    """LLM 응답을 점진적으로 렌더링하는 스트리밍 컨텍스트를 제공합니다.
+
+    Yields:
+        텍스트 델타를 받는 콜백 객체. streamed 속성으로
+        실제 렌더링 여부를 확인할 수 있습니다.
+    """
+    feed = _StreamFeed()
     try:
-        console.print(Markdown(content))
-    except Exception:
-        console.print(content)
+        yield feed
+    finally:
+        feed.close()
 
 
 def print_tool_call(tool_name: str) -> None:
@@ -96,8 +152,7 @@ def print_tool_call(tool_name: str) -> None:
     Args:
         tool_name: 호출할 도구 이름
     """
-    console.print()
-    console.print(f"[tool_name]Tool: {tool_name}[/tool_name]")
+    console.print(f"\n[tool_name]Tool: {tool_name}[/tool_name]")
 
 
 def print_tool_result(tool_name: str, result: str, max_chars: int = 3000) -> None:
@@ -119,6 +174,37 @@ def print_tool_result(tool_name: str, result: str, max_chars: int = 3000) -> Non
     console.print(panel)
 
 
+async def aprint_agent_response(content: str) -> None:
+    """print_agent_response의 비동기 버전.
+
+    긴 응답의 마크다운 파싱을 워커 스레드로 보내
+    이벤트 루프(Ctrl+C 처리, 동시 도구 실행)를 막지 않습니다.
+
+    Args:
+        content: LLM이 생성한 텍스트 응답
+    """
+    if len(content) > _ASYNC_RENDER_THRESHOLD:
+        await asyncio.to_thread(print_agent_response, content)
+    else:
+        print_agent_response(content)
+
+
+async def aprint_tool_result(tool_name: str, result: str, max_chars: int = 3000) -> None:
+    """print_tool_result의 비동기 버전.
+
+    긴 결과의 패널 렌더링을 워커 스레드로 보냅니다.
+
+    Args:
+        tool_name: 실행된 도구 이름
+        result: 도구 실행 결과 문자열
+        max_chars: 최대 표시 글자 수 (기본: 3000)
+    """
+    if len(result) > _ASYNC_RENDER_THRESHOLD:
+        await asyncio.to_thread(print_tool_result, tool_name, result, max_chars)
+    else:
+        print_tool_result(tool_name, result, max_chars)
+
+
 def print_error(message: str) -> None:
     """오류 메시지를 출력합니다.
 
@@ -143,13 +229,3 @@ def print_goodbye() -> None:
     console.print("[banner]Goodbye![/banner]")
     console.print()
 
-
-def print_auto_continue(round_num: int, max_rounds: int) -> None:
-    """자율 실행 모드에서 계속 진행 중임을 표시합니다.
-
-    Args:
-        round_num: 현재 자율 실행 라운드 번호 (1-indexed)
-        max_rounds: 최대 자율 실행 라운드 수
-    """
-    console.print()
-    console.print(f"[info](자율 실행 중... {round_num}/{max_rounds})[/info]")
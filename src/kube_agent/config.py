@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 # 클러스터 내부 기본 LLM 엔드포인트 (LiteLLM)
 _DEFAULT_LLM_URL = "http://litellm.litellm.svc.cluster.local:4000/v1"
@@ -19,6 +19,36 @@ _DEFAULT_GITEA_TIMEOUT = 30.0
 _DEFAULT_TOOL_RESULT_MAX_CHARS = 3000
 
 
+def _env_int(key: str, default: int = 0) -> int:
+    """환경 변수를 int로 파싱합니다. 비어 있으면 default를 반환합니다.
+
+    Raises:
+        RuntimeError: 값이 정수가 아닐 때 (어떤 변수인지 포함)
+    """
+    value = os.environ.get(key)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise RuntimeError(f"환경 변수 {key}={value!r}는 정수여야 합니다.") from exc
+
+
+def _env_float(key: str, default: float = 0.0) -> float:
+    """환경 변수를 float로 파싱합니다. 비어 있으면 default를 반환합니다.
+
+    Raises:
+        RuntimeError: 값이 숫자가 아닐 때 (어떤 변수인지 포함)
+    """
+    value = os.environ.get(key)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError as exc:
+        raise RuntimeError(f"환경 변수 {key}={value!r}는 숫자여야 합니다.") from exc
+
+
 @dataclass
 class AgentConfig:
     """에이전트 실행에 필요한 모든 설정을 관리하는 데이터클래스.
@@ -72,11 +102,11 @@ class AgentConfig:
             gitea_token=os.environ.get("KUBE_AGENT_GITEA_TOKEN", ""),
             kube_namespace=os.environ.get("KUBE_AGENT_NAMESPACE", ""),
             kube_context=os.environ.get("KUBE_AGENT_CONTEXT", ""),
-            max_messages=int(os.environ.get("KUBE_AGENT_MAX_MESSAGES", "0")),
-            max_tool_iterations=int(os.environ.get("KUBE_AGENT_MAX_TOOL_ITERATIONS", "0")),
-            max_auto_continue=int(os.environ.get("KUBE_AGENT_MAX_AUTO_CONTINUE", "0")),
-            gitea_timeout=float(os.environ.get("KUBE_AGENT_GITEA_TIMEOUT", "0")),
-            tool_result_max_chars=int(os.environ.get("KUBE_AGENT_TOOL_RESULT_MAX_CHARS", "0")),
+            max_messages=_env_int("KUBE_AGENT_MAX_MESSAGES"),
+            max_tool_iterations=_env_int("KUBE_AGENT_MAX_TOOL_ITERATIONS"),
+            max_auto_continue=_env_int("KUBE_AGENT_MAX_AUTO_CONTINUE"),
+            gitea_timeout=_env_float("KUBE_AGENT_GITEA_TIMEOUT"),
+            tool_result_max_chars=_env_int("KUBE_AGENT_TOOL_RESULT_MAX_CHARS"),
         )
 
     def merge(self, **overrides: str | bool | int | float) -> AgentConfig:
@@ -91,16 +121,9 @@ class AgentConfig:
         Returns:
             오버라이드가 적용된 새 AgentConfig 인스턴스
         """
-        updates: dict[str, str | bool | int | float] = {}
-        for key, value in overrides.items():
-            # CLI에서 제공된 값이 있으면(truthy) 기존 값과 관계없이 항상 덮어씀
-            if value:
-                updates[key] = value
-        if updates:
-            current = self.__dict__.copy()
-            current.update(updates)
-            return AgentConfig(**current)
-        return self
+        # CLI에서 제공된 값이 있으면(truthy) 기존 값과 관계없이 항상 덮어씀
+        updates = {key: value for key, value in overrides.items() if value}
+        return replace(self, **updates) if updates else self
 
     def resolve(self) -> AgentConfig:
         """기본값을 적용하여 최종 설정을 확정합니다.
@@ -110,18 +133,17 @@ class AgentConfig:
         Returns:
             기본값이 적용된 최종 AgentConfig 인스턴스
         """
-        return AgentConfig(
-            llm_base_url=self.llm_base_url or _DEFAULT_LLM_URL,
-            llm_api_key=self.llm_api_key or "no-key",
-            llm_model=self.llm_model or _DEFAULT_LLM_MODEL,
-            gitea_url=self.gitea_url or "",
-            gitea_token=self.gitea_token or "",
-            kube_namespace=self.kube_namespace or _DEFAULT_NAMESPACE,
-            kube_context=self.kube_context or "",
-            verbose=self.verbose,
-            max_messages=self.max_messages or _DEFAULT_MAX_MESSAGES,
-            max_tool_iterations=self.max_tool_iterations or _DEFAULT_MAX_TOOL_ITERATIONS,
-            max_auto_continue=self.max_auto_continue or _DEFAULT_MAX_AUTO_CONTINUE,
-            gitea_timeout=self.gitea_timeout or _DEFAULT_GITEA_TIMEOUT,
-            tool_result_max_chars=self.tool_result_max_chars or _DEFAULT_TOOL_RESULT_MAX_CHARS,
-        )
+        defaults = {
+            "llm_base_url": self.llm_base_url or _DEFAULT_LLM_URL,
+            "llm_api_key": self.llm_api_key or "no-key",
+            "llm_model": self.llm_model or _DEFAULT_LLM_MODEL,
+            "kube_namespace": self.kube_namespace or _DEFAULT_NAMESPACE,
+            "max_messages": self.max_messages or _DEFAULT_MAX_MESSAGES,
+            "max_tool_iterations": self.max_tool_iterations or _DEFAULT_MAX_TOOL_ITERATIONS,
+            "max_auto_continue": self.max_auto_continue or _DEFAULT_MAX_AUTO_CONTINUE,
+            "gitea_timeout": self.gitea_timeout or _DEFAULT_GITEA_TIMEOUT,
+            "tool_result_max_chars": self.tool_result_max_chars or _DEFAULT_TOOL_RESULT_MAX_CHARS,
+        }
+        # 이미 모든 필드가 채워져 있으면 새 인스턴스를 만들지 않음
+        updates = {key: value for key, value in defaults.items() if value != getattr(self, key)}
+        return replace(self, **updates) if updates else self
@@ -6,20 +6,84 @@ Git clone 후 로컬 파일을 조회하고 편집하기 위한 파일 조작 
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
 import logging
+import mmap
+import operator
 import os
+import tempfile
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 # 파일 읽기 최대 크기 (1MB)
 _MAX_READ_SIZE = 1_048_576
+# 이 크기 이상이면 read 루프 대신 mmap으로 매핑해 중간 복사를 줄입니다 (64KB)
+_MMAP_READ_THRESHOLD = 65_536
 # 파일 쓰기 최대 크기 (1MB)
 _MAX_WRITE_SIZE = 1_048_576
 # 디렉토리 목록 최대 항목 수
 _MAX_LIST_ENTRIES = 500
+# DirEntry 정렬 키 (람다 대신 C 구현 attrgetter)
+_ENTRY_NAME = operator.attrgetter("name")
 # 허용된 sandbox 디렉토리 목록
 _SANDBOX_DIRS = ("/tmp", "/home/agent")
+# startswith용 프리픽스 (os.sep 부착으로 "/tmpfoo" 같은 유사 경로 차단)
+_SANDBOX_PREFIXES = tuple(d.rstrip("/") + os.sep for d in _SANDBOX_DIRS)
+
+
+def _walk_tree(root: str):
+    """os.walk(scandir 기반)로 트리를 순회하며 (상대 경로, 디렉토리 여부)를 냅니다.
+
+    디렉토리별로 이름을 정렬해 결정적인 선순위(preorder) 순서를 유지하며,
+    호출 측에서 islice로 중단하면 나머지 트리는 아예 방문하지 않습니다.
+
+    Args:
+        root: 순회 시작 디렉토리
+
+    Yields:
+        (루트 기준 상대 경로, 디렉토리 여부) 튜플
+    """
+    for current, dirs, files in os.walk(root, followlinks=False):
+        dirs.sort()
+        files.sort()
+        rel_base = os.path.relpath(current, root)
+        prefix = "" if rel_base == "." else rel_base + "/"
+        # 선순위 정렬: 디렉토리와 파일을 이름순으로 병합
+        di, fi = 0, 0
+        while di < len(dirs) and fi < len(files):
+            if dirs[di] <= files[fi]:
+                yield prefix + dirs[di], True
+                di += 1
+            else:
+                yield prefix + files[fi], False
+                fi += 1
+        for name in dirs[di:]:
+            yield prefix + name, True
+        for name in files[fi:]:
+            yield prefix + name, False
+
+
+def _iter_formatted(root: str, recursive: bool):
+    """디렉토리 항목을 포맷된 줄 문자열로 순회합니다 (제한 없음).
+
+    Args:
+        root: 순회할 디렉토리 경로
+        recursive: True이면 하위 디렉토리까지 재귀적으로 탐색
+
+    Yields:
+        "  이름" 형식의 줄 (디렉토리는 '/' 접미사)
+    """
+    if recursive:
+        for rel, is_dir in _walk_tree(root):
+            yield f"  {rel}/" if is_dir else f"  {rel}"
+    else:
+        with os.scandir(root) as it:
+            for entry in it:
+                yield f"  {entry.name}/" if entry.is_dir(follow_symlinks=False) else f"  {entry.name}"
 
 
 class FileOps:
@@ -40,22 +104,24 @@ class FileOps:
             검증 통과 시 None, 실패 시 오류 메시지 문자열
         """
         try:
-            resolved = str(Path(path).resolve())
+            # os.path.realpath는 Path.resolve()와 동일하게 심볼릭 링크를
+            # 따라가되 중간 PurePath 객체 생성 없이 한 번에 처리합니다.
+            resolved = os.path.realpath(path)
         except (OSError, ValueError) as exc:
             return f"경로를 확인할 수 없습니다: {exc}"
 
-        for sandbox in _SANDBOX_DIRS:
-            if resolved.startswith(sandbox):
-                return None
+        if resolved in _SANDBOX_DIRS or resolved.startswith(_SANDBOX_PREFIXES):
+            return None
 
         return f"보안 제한: '{path}'에 접근할 수 없습니다. 허용된 디렉토리: {', '.join(_SANDBOX_DIRS)}"
 
-    def list_directory(self, path: str, recursive: bool = False) -> str:
+    def list_directory(self, path: str, recursive: bool = False, max_entries: int = 0) -> str:
         """디렉토리 내 파일 및 하위 디렉토리 목록을 반환합니다.
 
         Args:
             path: 디렉토리 경로
             recursive: True이면 하위 디렉토리까지 재귀적으로 탐색
+            max_entries: 최대 항목 수 (0이면 기본값 _MAX_LIST_ENTRIES)
 
         Returns:
             파일 목록 문자열 (디렉토리는 '/' 접미사 표시)
@@ -70,23 +136,29 @@ class FileOps:
         if not target.is_dir():
             return f"디렉토리가 아닙니다: {path}"
 
+        limit = max_entries or _MAX_LIST_ENTRIES
+
         try:
             entries: list[str] = []
+            # 루프 내 LOAD_ATTR을 피하기 위한 로컬 바인딩
+            append = entries.append
             if recursive:
-                for item in sorted(target.rglob("*")):
-                    if len(entries) >= _MAX_LIST_ENTRIES:
-                        entries.append(f"... ({_MAX_LIST_ENTRIES}개 항목 제한 도달)")
-                        break
-                    rel = item.relative_to(target)
-                    suffix = "/" if item.is_dir() else ""
-                    entries.append(f"  {rel}{suffix}")
+                # 전체 트리를 모으지 않고 제한+1개까지만 순회 후 중단합니다.
+                collected = list(itertools.islice(_walk_tree(path), limit + 1))
+                for rel, is_dir in collected[:limit]:
+                    append(f"  {rel}/" if is_dir else f"  {rel}")
+                if len(collected) > limit:
+                    append(f"... ({limit}개 항목 제한 도달)")
             else:
-                for item in sorted(target.iterdir()):
-                    if len(entries) >= _MAX_LIST_ENTRIES:
-                        entries.append(f"... ({_MAX_LIST_ENTRIES}개 항목 제한 도달)")
-                        break
-                    suffix = "/" if item.is_dir() else ""
-                    entries.append(f"  {item.name}{suffix}")
+                # 전체 정렬(O(N log N)) 대신 제한+1개만 힙으로 유지합니다.
+                # 메모리도 O(N)이 아닌 O(제한)만 사용합니다.
+                with os.scandir(path) as it:
+                    children = heapq.nsmallest(limit + 1, it, key=_ENTRY_NAME)
+                for entry in children[:limit]:
+                    name = entry.name
+                    append(f"  {name}/" if entry.is_dir(follow_symlinks=False) else f"  {name}")
+                if len(children) > limit:
+                    append(f"... ({limit}개 항목 제한 도달)")
 
             if not entries:
                 return f"디렉토리가 비어있습니다: {path}"
@@ -101,6 +173,34 @@ class FileOps:
         except Exception as exc:
             return f"디렉토리 목록 조회 중 오류: {exc}"
 
+    async def iter_directory(
+        self,
+        path: str,
+        recursive: bool = False,
+        batch_size: int = 64,
+    ) -> AsyncIterator[list[str]]:
+        """디렉토리 항목을 배치 단위로 비동기 스트리밍합니다.
+
+        list_directory와 달리 항목 수 제한 없이 O(batch_size) 메모리로
+        순회하며, 블로킹 디렉토리 순회는 워커 스레드에서 수행됩니다.
+
+        Args:
+            path: 디렉토리 경로
+            recursive: True이면 하위 디렉토리까지 재귀적으로 탐색
+            batch_size: 한 번에 yield할 줄 수
+
+        Yields:
+            포맷된 줄 문자열의 배치 (디렉토리는 '/' 접미사)
+        """
+        error = self._validate_path(path)
+        if error:
+            yield [error]
+            return
+
+        gen = _iter_formatted(path, recursive)
+        while batch := await asyncio.to_thread(lambda: list(itertools.islice(gen, batch_size))):
+            yield batch
+
     def read_file(self, path: str) -> str:
         """파일 내용을 읽어 반환합니다.
 
@@ -121,12 +221,37 @@ class FileOps:
             return f"파일이 아닙니다 (디렉토리일 수 있음): {path}"
 
         try:
-            size = target.stat().st_size
-            if size > _MAX_READ_SIZE:
-                return f"파일이 너무 큽니다: {size:,} bytes (최대 {_MAX_READ_SIZE:,} bytes). 파일 경로: {path}"
-
-            content = target.read_text(encoding="utf-8")
-            line_count = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                size = os.fstat(fd).st_size
+                if size > _MAX_READ_SIZE:
+                    return f"파일이 너무 큽니다: {size:,} bytes (최대 {_MAX_READ_SIZE:,} bytes). 파일 경로: {path}"
+
+                if size >= _MMAP_READ_THRESHOLD:
+                    # 큰 파일은 페이지 캐시를 그대로 매핑해 buffer protocol로
+                    # 바로 디코딩합니다 (중간 bytes 객체 할당 제거).
+                    mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+                    try:
+                        if hasattr(mm, "madvise"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        content = str(memoryview(mm), "utf-8")
+                    finally:
+                        mm.close()
+                    line_count = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
+                else:
+                    # 순차 읽기 힌트로 커널 readahead를 유도 (지원 플랫폼 한정)
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                    chunks: list[bytes] = []
+                    while chunk := os.read(fd, _MAX_READ_SIZE):
+                        chunks.append(chunk)
+                    buf = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+                    # 줄 수는 디코딩 전에 바이트 단위(memchr 루프)로 계산
+                    line_count = buf.count(b"\n") + (1 if buf and not buf.endswith(b"\n") else 0)
+                    content = buf.decode("utf-8")
+            finally:
+                os.close(fd)
             header = f"--- {path} ({line_count} lines, {size:,} bytes) ---"
             return header + "\n" + content
 
@@ -137,6 +262,21 @@ class FileOps:
         except Exception as exc:
             return f"파일 읽기 중 오류: {exc}"
 
+    async def read_files(self, paths: list[str]) -> list[str]:
+        """여러 파일을 동시에 읽어 각 결과를 반환합니다.
+
+        각 read_file을 워커 스레드로 보내 asyncio.gather로 병렬 실행하므로
+        N개 파일의 전체 지연이 sum이 아닌 max 수준으로 줄어듭니다.
+        개별 파일의 오류는 해당 항목의 오류 메시지로 반환됩니다.
+
+        Args:
+            paths: 읽을 파일 경로 리스트
+
+        Returns:
+            paths와 같은 순서의 read_file 결과 리스트
+        """
+        return list(await asyncio.gather(*(asyncio.to_thread(self.read_file, path) for path in paths)))
+
     def write_file(self, path: str, content: str, create_dirs: bool = False) -> str:
         """파일에 내용을 씁니다 (덮어쓰기).
 
@@ -152,26 +292,56 @@ class FileOps:
         if error:
             return error
 
-        encoded_size = len(content.encode("utf-8"))
-        if encoded_size > _MAX_WRITE_SIZE:
-            return f"쓰기 내용이 너무 큽니다: {encoded_size:,} bytes (최대 {_MAX_WRITE_SIZE:,} bytes)"
+        # 한 번만 인코딩하고 크기 검사/쓰기/줄 수 계산 모두 재사용
+        data = content.encode("utf-8")
+        if len(data) > _MAX_WRITE_SIZE:
+            return f"쓰기 내용이 너무 큽니다: {len(data):,} bytes (최대 {_MAX_WRITE_SIZE:,} bytes)"
 
         target = Path(path)
 
         try:
             if create_dirs:
                 target.parent.mkdir(parents=True, exist_ok=True)
-            elif not target.parent.exists():
-                return f"부모 디렉토리가 존재하지 않습니다: {target.parent}"
-
-            existed = target.exists()
-            target.write_text(content, encoding="utf-8")
-
-            size = target.stat().st_size
-            line_count = content.count("\n") + (1 if content and not content.endswith("\n") else 0)
+            # create_dirs=False일 때 부모 존재 여부는 미리 stat하지 않고
+            # 임시 파일 생성의 FileNotFoundError로 판별합니다 (syscall 절약).
+
+            existed = os.path.lexists(path)
+
+            # 같은 디렉토리의 임시 파일에 쓰고 fsync 후 원자적으로 교체하여
+            # 프로세스가 중간에 죽어도 잘린(torn) 파일이 남지 않습니다.
+            tmp_fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".tmp_")
+            try:
+                try:
+                    # mkstemp는 0600으로 만들므로 교체 전에 모드를 맞춥니다:
+                    # 기존 파일은 실행 비트 등 원래 모드 유지 (git이 모드를
+                    # 추적하므로 중요), 새 파일은 umask 적용 기본 모드.
+                    try:
+                        mode = os.stat(path).st_mode & 0o7777
+                    except FileNotFoundError:
+                        umask = os.umask(0)
+                        os.umask(umask)
+                        mode = 0o666 & ~umask
+                    os.fchmod(tmp_fd, mode)
+                    view = memoryview(data)
+                    while view:
+                        written = os.write(tmp_fd, view)
+                        view = view[written:]
+                    os.fsync(tmp_fd)
+                finally:
+                    os.close(tmp_fd)
+                os.replace(tmp_path, path)
+            except BaseException:
+                # 쓰기·교체 어느 단계에서 실패하든 임시 파일을 남기지 않습니다
+                # (git 샌드박스 안이라 잔류 시 git add -A에 쓸려 들어감)
+                os.unlink(tmp_path)
+                raise
+
+            line_count = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
             action = "수정" if existed else "생성"
-            return f"파일 {action} 완료: {path} ({line_count} lines, {size:,} bytes)"
+            return f"파일 {action} 완료: {path} ({line_count} lines, {len(data):,} bytes)"
 
+        except FileNotFoundError:
+            return f"부모 디렉토리가 존재하지 않습니다: {target.parent}"
         except PermissionError:
             return f"파일 쓰기 권한이 없습니다: {path}"
         except Exception as exc:
@@ -7,15 +7,52 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from pathlib import Path
+import os
 from typing import Any
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 # Git 작업에 허용된 sandbox 디렉토리 (file_ops.py와 동일)
 _GIT_SANDBOX_DIRS = ("/tmp", "/home/agent")
+# startswith용 프리픽스 (os.sep 부착으로 "/tmpfoo" 같은 유사 경로 차단)
+_GIT_SANDBOX_PREFIXES = tuple(d.rstrip("/") + os.sep for d in _GIT_SANDBOX_DIRS)
+
+# 목록 출력용 테이블 헤더와 행 포맷터 (바인딩된 str.format, 루프당 f-string 생성 제거)
+_REPO_HEADER = f"{'OWNER/NAME':<40} {'PRIVATE':<10} {'DESCRIPTION':<50}\n" + "-" * 100
+_REPO_ROW = "{:<40} {:<10} {:<50}".format
+_BRANCH_HEADER = f"{'BRANCH':<40} {'COMMIT (short)':<15}\n" + "-" * 55
+_BRANCH_ROW = "{:<40} {:<15}".format
+_USER_HEADER = f"{'USERNAME':<25} {'EMAIL':<35} {'ADMIN':<8}\n" + "-" * 68
+_USER_ROW = "{:<25} {:<35} {:<8}".format
+_HOOK_HEADER = f"{'ID':<8} {'URL':<50} {'ACTIVE':<8} {'EVENTS':<30}\n" + "-" * 96
+_HOOK_ROW = "{:<8} {:<50} {:<8} {:<30}".format
+
+# 목록 API 페이지 크기 및 한 번에 수집할 최대 페이지 수
+_LIST_PAGE_SIZE = 50
+_MAX_LIST_PAGES = 10
+
+# (base_url, token)별 프로세스 공용 httpx 클라이언트 레지스트리.
+# 같은 서버를 가리키는 GiteaOps 인스턴스가 여러 개 생성되어도
+# TCP/TLS 핸드셰이크와 커넥션 풀을 공유합니다.
+_DEFAULT_CLIENTS: dict[tuple[str, str], httpx.AsyncClient] = {}
+
+
+# Git subprocess 공통 환경: 인증 프롬프트로 인한 영구 블로킹을 막고(prompt=0),
+# 로케일 의존 출력 포매팅을 건너뜁니다(LC_ALL=C).
+# GIT_OPTIONAL_LOCKS=0은 상태 조회류 명령이 불필요한 락 파일을 만들지 않게 합니다.
+_GIT_ENV_OVERRIDES = {"GIT_TERMINAL_PROMPT": "0", "LC_ALL": "C", "GIT_OPTIONAL_LOCKS": "0"}
+# asyncio StreamReader 버퍼 한도 (대용량 clone 출력 역압 방지, 1MB)
+_GIT_STREAM_LIMIT = 2**20
+
+
+async def close_shared_clients() -> None:
+    """레지스트리의 공용 클라이언트를 모두 닫습니다 (프로세스 종료 시 호출)."""
+    while _DEFAULT_CLIENTS:
+        _, shared = _DEFAULT_CLIENTS.popitem()
+        await shared.aclose()
 
 
 class GiteaOps:
@@ -24,41 +61,71 @@ class GiteaOps:
     Gitea REST API (httpx 비동기)와 Git CLI (subprocess)를
     통해 저장소, 브랜치, 웹훅 등을 관리합니다.
 
-    httpx.AsyncClient를 클래스 레벨에서 관리하여 커넥션 풀을 재사용합니다.
+    httpx.AsyncClient를 인스턴스 레벨에서 관리하여 커넥션 풀을 재사용하며,
+    외부에서 공유 클라이언트를 주입받을 수도 있습니다.
     사용 후 close()를 반드시 호출하세요.
     """
 
-    def __init__(self, gitea_url: str, token: str, timeout: float = 30.0) -> None:
+    def __init__(
+        self,
+        gitea_url: str,
+        token: str,
+        timeout: float = 30.0,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
         """Gitea 클라이언트를 초기화합니다.
 
         Args:
             gitea_url: Gitea 서버 URL (예: http://gitea.ops:3000)
             token: Gitea API 인증 토큰
             timeout: HTTP 요청 타임아웃 초 (기본: 30)
+            client: 공유할 httpx.AsyncClient (없으면 자체 생성)
         """
         self._base_url = gitea_url.rstrip("/")
         self._token = token
         self._api_url = f"{self._base_url}/api/v1"
-        # 커넥션 풀 재사용을 위해 클라이언트를 클래스 레벨에서 관리
-        self._client = httpx.AsyncClient(
-            timeout=timeout,
-            headers=self._build_headers(),
-        )
-
-    def _build_headers(self) -> dict[str, str]:
-        """API 요청에 사용할 인증 헤더를 반환합니다."""
-        headers: dict[str, str] = {"Content-Type": "application/json"}
-        if self._token:
-            headers["Authorization"] = f"token {self._token}"
-        return headers
+        # 인증 헤더는 한 번만 구성해 모든 요청에 재사용합니다.
+        # Content-Type은 httpx가 json= 요청에 자동으로 붙이므로 생략합니다.
+        self._headers = {"Authorization": f"token {token}"} if token else {}
+        self._timeout = timeout
+        # 커넥션 풀 재사용을 위해 클라이언트를 인스턴스 레벨에서 관리.
+        # 주입된 공유 클라이언트는 소유권이 없으므로 close()에서 닫지 않습니다.
+        if client is not None:
+            self._client = client
+            self._owns_client = False
+        else:
+            # 주입이 없으면 (base_url, token) 키의 공용 클라이언트를 재사용.
+            # HTTP/2 멀티플렉싱으로 동시 요청(repo_overview 등)이
+            # 하나의 커넥션 위에서 병렬 처리됩니다.
+            key = (self._base_url, token)
+            shared = _DEFAULT_CLIENTS.get(key)
+            if shared is None or shared.is_closed:
+                shared = httpx.AsyncClient(
+                    timeout=timeout,
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=20,
+                        max_connections=50,
+                        keepalive_expiry=60.0,
+                    ),
+                )
+                _DEFAULT_CLIENTS[key] = shared
+            self._client = shared
+            self._owns_client = False
 
     def _enabled(self) -> bool:
         """Gitea 연결이 설정되어 있는지 확인합니다."""
         return bool(self._base_url)
 
     async def close(self) -> None:
-        """httpx 클라이언트를 닫고 커넥션 풀을 해제합니다."""
-        await self._client.aclose()
+        """이 인스턴스가 소유한 httpx 클라이언트를 닫습니다.
+
+        주입되었거나 공용 레지스트리에서 가져온 클라이언트는 다른
+        인스턴스가 계속 사용할 수 있으므로 닫지 않습니다. 프로세스 종료
+        시점에는 close_shared_clients()를 호출하세요.
+        """
+        if self._owns_client:
+            await self._client.aclose()
 
     def _validate_git_path(self, path: str) -> str | None:
         """Git 작업 경로가 sandbox 내에 있는지 검증합니다.
@@ -70,16 +137,61 @@ class GiteaOps:
             검증 통과 시 None, 실패 시 오류 메시지 문자열
         """
         try:
-            resolved = str(Path(path).resolve())
+            # 심볼릭 링크를 따라가는 해석을 pathlib 객체 생성 없이 한 번에 수행
+            resolved = os.path.realpath(path)
         except (OSError, ValueError) as exc:
             return f"경로를 확인할 수 없습니다: {exc}"
 
-        for sandbox in _GIT_SANDBOX_DIRS:
-            if resolved.startswith(sandbox):
-                return None
+        if resolved in _GIT_SANDBOX_DIRS or resolved.startswith(_GIT_SANDBOX_PREFIXES):
+            return None
 
         return f"보안 제한: '{path}'에 접근할 수 없습니다. 허용된 디렉토리: {', '.join(_GIT_SANDBOX_DIRS)}"
 
+    async def _fetch_all_pages(
+        self,
+        url: str,
+        params: dict[str, Any],
+        extract: Any,
+    ) -> list[dict[str, Any]]:
+        """목록 엔드포인트의 모든 페이지를 수집합니다.
+
+        첫 페이지 응답의 X-Total-Count 헤더로 전체 페이지 수를 계산하고,
+        나머지 페이지는 asyncio.gather로 동시에 요청합니다 (HTTP/2 연결
+        하나 위에서 멀티플렉싱되므로 전체 지연이 한 페이지 수준입니다).
+
+        Args:
+            url: 목록 엔드포인트 URL
+            params: 기본 쿼리 파라미터 (limit/page는 여기서 관리)
+            extract: 응답 페이로드에서 항목 리스트를 꺼내는 callable
+
+        Returns:
+            전 페이지의 항목을 합친 리스트 (_MAX_LIST_PAGES 페이지 상한)
+        """
+        first_params = {**params, "limit": _LIST_PAGE_SIZE, "page": 1}
+        resp = await self._client.get(url, params=first_params, headers=self._headers, timeout=self._timeout)
+        resp.raise_for_status()
+        items: list[dict[str, Any]] = list(extract(orjson.loads(resp.content)))
+
+        total = int(resp.headers.get("x-total-count", "0") or 0)
+        pages = min(-(-total // _LIST_PAGE_SIZE), _MAX_LIST_PAGES)
+        if pages > 1:
+            responses = await asyncio.gather(
+                *(
+                    self._client.get(
+                        url,
+                        params={**first_params, "page": page},
+                        headers=self._headers,
+                        timeout=self._timeout,
+                    )
+                    for page in range(2, pages + 1)
+                )
+            )
+            for page_resp in responses:
+                page_resp.raise_for_status()
+                items.extend(extract(orjson.loads(page_resp.content)))
+
+        return items
+
     # ---- REST API 메서드 (httpx 비동기) ----
 
     async def list_repos(self) -> str:
@@ -92,26 +204,23 @@ class GiteaOps:
             return "Gitea URL이 설정되지 않았습니다."
 
         try:
-            resp = await self._client.get(
+            repos = await self._fetch_all_pages(
                 f"{self._api_url}/repos/search",
-                params={"limit": 50},
+                params={},
+                extract=lambda data: data.get("data", []) if isinstance(data, dict) else data,
             )
-            resp.raise_for_status()
-            data = resp.json()
-
-            repos: list[dict[str, Any]] = data.get("data", []) if isinstance(data, dict) else data
             if not repos:
                 return "접근 가능한 저장소가 없습니다."
 
-            lines = [f"{'OWNER/NAME':<40} {'PRIVATE':<10} {'DESCRIPTION':<50}"]
-            lines.append("-" * 100)
-            for repo in repos:
-                full_name = repo.get("full_name", "unknown")
-                private = "Yes" if repo.get("private") else "No"
-                desc = (repo.get("description", "") or "")[:50]
-                lines.append(f"{full_name:<40} {private:<10} {desc:<50}")
-
-            return "\n".join(lines)
+            rows = "\n".join(
+                _REPO_ROW(
+                    repo.get("full_name", "unknown"),
+                    "Yes" if repo.get("private") else "No",
+                    (repo.get("description", "") or "")[:50],
+                )
+                for repo in repos
+            )
+            return f"{_REPO_HEADER}\n{rows}"
         except httpx.HTTPStatusError as exc:
             return f"저장소 목록 조회 실패: HTTP {exc.response.status_code}"
         except Exception as exc:
@@ -131,9 +240,11 @@ class GiteaOps:
             return "Gitea URL이 설정되지 않았습니다."
 
         try:
-            resp = await self._client.get(f"{self._api_url}/repos/{owner}/{name}")
+            resp = await self._client.get(
+                f"{self._api_url}/repos/{owner}/{name}", headers=self._headers, timeout=self._timeout
+            )
             resp.raise_for_status()
-            repo = resp.json()
+            repo = orjson.loads(resp.content)
 
             lines = [f"Repository: {repo.get('full_name', 'unknown')}"]
             lines.append(f"  Description: {repo.get('description', '(none)')}")
@@ -173,9 +284,11 @@ class GiteaOps:
                 "private": private,
                 "auto_init": True,
             }
-            resp = await self._client.post(f"{self._api_url}/user/repos", json=payload)
+            resp = await self._client.post(
+                f"{self._api_url}/user/repos", json=payload, headers=self._headers, timeout=self._timeout
+            )
             resp.raise_for_status()
-            repo = resp.json()
+            repo = orjson.loads(resp.content)
 
             return f"저장소 '{repo.get('full_name', name)}' 생성 완료.\n  Clone URL: {repo.get('clone_url', '')}"
         except httpx.HTTPStatusError as exc:
@@ -197,7 +310,9 @@ class GiteaOps:
             return "Gitea URL이 설정되지 않았습니다."
 
         try:
-            resp = await self._client.delete(f"{self._api_url}/repos/{owner}/{name}")
+            resp = await self._client.delete(
+                f"{self._api_url}/repos/{owner}/{name}", headers=self._headers, timeout=self._timeout
+            )
             resp.raise_for_status()
 
             return f"저장소 '{owner}/{name}' 삭제 완료."
@@ -220,21 +335,23 @@ class GiteaOps:
             return "Gitea URL이 설정되지 않았습니다."
 
         try:
-            resp = await self._client.get(f"{self._api_url}/repos/{owner}/{repo}/branches")
+            resp = await self._client.get(
+                f"{self._api_url}/repos/{owner}/{repo}/branches", headers=self._headers, timeout=self._timeout
+            )
             resp.raise_for_status()
-            branches = resp.json()
+            branches = orjson.loads(resp.content)
 
             if not branches:
                 return f"저장소 '{owner}/{repo}'에 브랜치가 없습니다."
 
-            lines = [f"{'BRANCH':<40} {'COMMIT (short)':<15}"]
-            lines.append("-" * 55)
-            for branch in branches:
-                branch_name = branch.get("name", "unknown")
-                commit_id = branch.get("commit", {}).get("id", "")[:8]
-                lines.append(f"{branch_name:<40} {commit_id:<15}")
-
-            return "\n".join(lines)
+            rows = "\n".join(
+                _BRANCH_ROW(
+                    branch.get("name", "unknown"),
+                    branch.get("commit", {}).get("id", "")[:8],
+                )
+                for branch in branches
+            )
+            return f"{_BRANCH_HEADER}\n{rows}"
         except httpx.HTTPStatusError as exc:
             return f"브랜치 목록 조회 실패: HTTP {exc.response.status_code}"
         except Exception as exc:
@@ -250,22 +367,23 @@ class GiteaOps:
             return "Gitea URL이 설정되지 않았습니다."
 
         try:
-            resp = await self._client.get(f"{self._api_url}/admin/users", params={"limit": 50})
-            resp.raise_for_status()
-            users = resp.json()
-
+            users = await self._fetch_all_pages(
+                f"{self._api_url}/admin/users",
+                params={},
+                extract=lambda data: data or [],
+            )
             if not users:
                 return "사용자가 없습니다."
 
-            lines = [f"{'USERNAME':<25} {'EMAIL':<35} {'ADMIN':<8}"]
-            lines.append("-" * 68)
-            for user in users:
-                username = user.get("login", "unknown")
-                email = user.get("email", "")
-                is_admin = "Yes" if user.get("is_admin") else "No"
-                lines.append(f"{username:<25} {email:<35} {is_admin:<8}")
-
-            return "\n".join(lines)
+            rows = "\n".join(
+                _USER_ROW(
+                    user.get("login", "unknown"),
+                    user.get("email", ""),
+                    "Yes" if user.get("is_admin") else "No",
+                )
+                for user in users
+            )
+            return f"{_USER_HEADER}\n{rows}"
         except httpx.HTTPStatusError as exc:
             return f"사용자 목록 조회 실패: HTTP {exc.response.status_code}"
         except Exception as exc:
@@ -305,9 +423,11 @@ class GiteaOps:
             resp = await self._client.post(
                 f"{self._api_url}/repos/{owner}/{repo}/hooks",
                 json=payload,
+                headers=self._headers,
+                timeout=self._timeout,
             )
             resp.raise_for_status()
-            hook = resp.json()
+            hook = orjson.loads(resp.content)
 
             return (
                 f"웹훅 생성 완료 (ID: {hook.get('id', 'unknown')})\n"
@@ -333,28 +453,53 @@ class GiteaOps:
             return "Gitea URL이 설정되지 않았습니다."
 
         try:
-            resp = await self._client.get(f"{self._api_url}/repos/{owner}/{repo}/hooks")
+            resp = await self._client.get(
+                f"{self._api_url}/repos/{owner}/{repo}/hooks", headers=self._headers, timeout=self._timeout
+            )
             resp.raise_for_status()
-            hooks = resp.json()
+            hooks = orjson.loads(resp.content)
 
             if not hooks:
                 return f"저장소 '{owner}/{repo}'에 웹훅이 없습니다."
 
-            lines = [f"{'ID':<8} {'URL':<50} {'ACTIVE':<8} {'EVENTS':<30}"]
-            lines.append("-" * 96)
-            for hook in hooks:
-                hook_id = str(hook.get("id", ""))
-                url = hook.get("config", {}).get("url", "")[:50]
-                active = "Yes" if hook.get("active") else "No"
-                events = ", ".join(hook.get("events", []))[:30]
-                lines.append(f"{hook_id:<8} {url:<50} {active:<8} {events:<30}")
-
-            return "\n".join(lines)
+            rows = "\n".join(
+                _HOOK_ROW(
+                    str(hook.get("id", "")),
+                    hook.get("config", {}).get("url", "")[:50],
+                    "Yes" if hook.get("active") else "No",
+                    ", ".join(hook.get("events", []))[:30],
+                )
+                for hook in hooks
+            )
+            return f"{_HOOK_HEADER}\n{rows}"
         except httpx.HTTPStatusError as exc:
             return f"웹훅 목록 조회 실패: HTTP {exc.response.status_code}"
         except Exception as exc:
             return f"웹훅 목록 조회 중 오류: {exc}"
 
+    async def repo_overview(self, owner: str, repo: str) -> str:
+        """저장소 상세·브랜치·웹훅 정보를 한 번에 조회합니다.
+
+        세 REST 요청을 asyncio.gather로 동시에 보내므로 전체 지연이
+        sum(latency)가 아닌 max(latency)로 줄어듭니다.
+
+        Args:
+            owner: 저장소 소유자
+            repo: 저장소 이름
+
+        Returns:
+            저장소 상세, 브랜치 목록, 웹훅 목록이 합쳐진 문자열
+        """
+        if not self._enabled():
+            return "Gitea URL이 설정되지 않았습니다."
+
+        detail, branches, hooks = await asyncio.gather(
+            self.get_repo(owner, repo),
+            self.list_branches(owner, repo),
+            self.list_webhooks(owner, repo),
+        )
+        return f"{detail}\n\n[Branches]\n{branches}\n\n[Webhooks]\n{hooks}"
+
     # ---- Git CLI 메서드 (subprocess 비동기) ----
 
     async def _run_git(self, args: list[str], cwd: str | None = None) -> str:
@@ -373,7 +518,10 @@ class GiteaOps:
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                stdin=asyncio.subprocess.DEVNULL,
                 cwd=cwd,
+                limit=_GIT_STREAM_LIMIT,
+                env={**os.environ, **_GIT_ENV_OVERRIDES},
             )
             stdout, stderr = await proc.communicate()
 
@@ -420,11 +568,13 @@ class GiteaOps:
         result = await self._run_git(["pull"], cwd=path)
         return f"git pull ({path})\n{result}"
 
-    async def git_status(self, path: str) -> str:
+    async def git_status(self, path: str, mode: str = "full") -> str:
         """Git 상태를 확인합니다.
 
         Args:
             path: Git 작업 디렉토리 경로 (sandbox 내여야 함)
+            mode: "full"이면 변경 파일 목록, "dirty"면 변경 여부만 확인
+                (dirty 모드는 출력 파싱 없이 종료 코드만 보므로 훨씬 빠름)
 
         Returns:
             상태 문자열
@@ -432,6 +582,34 @@ class GiteaOps:
         error = self._validate_git_path(path)
         if error:
             return error
+
+        if mode == "dirty":
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "git",
+                    "diff-index",
+                    "--quiet",
+                    "HEAD",
+                    "--",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    cwd=path,
+                    env={**os.environ, **_GIT_ENV_OVERRIDES},
+                )
+                _, stderr = await proc.communicate()
+
+                if proc.returncode == 0:
+                    return f"git status ({path}): clean"
+                if proc.returncode == 1:
+                    return f"git status ({path}): dirty (커밋되지 않은 변경사항 있음)"
+                error_out = stderr.decode("utf-8", errors="replace").strip()
+                return f"Git 명령 실패 (exit code {proc.returncode}):\n{error_out}"
+            except FileNotFoundError:
+                return "git 명령을 찾을 수 없습니다. git이 설치되어 있는지 확인해주세요."
+            except Exception as exc:
+                return f"Git 명령 실행 중 오류: {exc}"
+
         result = await self._run_git(["status", "--short"], cwd=path)
         return f"git status ({path})\n{result}"
 
@@ -448,8 +626,36 @@ class GiteaOps:
         error = self._validate_git_path(path)
         if error:
             return error
-        add_result = await self._run_git(["add", "-A"], cwd=path)
-        commit_result = await self._run_git(["commit", "-m", message], cwd=path)
-        push_result = await self._run_git(["push"], cwd=path)
 
-        return f"git add -A: {add_result}\ngit commit: {commit_result}\ngit push: {push_result}"
+        # 3회의 fork/exec 대신 셸 한 번으로 묶어 실행합니다.
+        # 커밋 메시지는 argv($1)로 전달되므로 셸 해석을 거치지 않습니다.
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "sh",
+                "-c",
+                'git add -A && git commit -m "$1" && git push',
+                "sh",
+                message,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                stdin=asyncio.subprocess.DEVNULL,
+                cwd=path,
+                limit=_GIT_STREAM_LIMIT,
+                env={**os.environ, **_GIT_ENV_OVERRIDES},
+            )
+            stdout, stderr = await proc.communicate()
+
+            output = stdout.decode("utf-8", errors="replace").strip()
+            error_out = stderr.decode("utf-8", errors="replace").strip()
+
+            if proc.returncode != 0:
+                return (
+                    f"git commit/push 실패 (exit code {proc.returncode}):\n"
+                    f"{error_out or output or '(no output)'}"
+                )
+
+            return f"git add/commit/push ({path})\n{output or '(no output)'}"
+        except FileNotFoundError:
+            return "git 명령을 찾을 수 없습니다. git이 설치되어 있는지 확인해주세요."
+        except Exception as exc:
+            return f"Git 명령 실행 중 오류: {exc}"
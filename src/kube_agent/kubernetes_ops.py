@@ -6,37 +6,162 @@ Kubernetes API를 통해 클러스터 리소스를 조회하고 관리합니다.
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import functools
+import heapq
+import io
 import logging
+import operator
+import time
 from datetime import UTC, datetime
 from typing import Any
 
+import orjson
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 
 logger = logging.getLogger(__name__)
 
+# 공용 ApiClient의 urllib3 커넥션 풀 크기 (동시 list/get 호출이 직렬화되지 않도록)
+_CONNECTION_POOL_SIZE = 50
+# list 호출 페이지 크기: 거대한 네임스페이스에서도 응답/메모리가 O(페이지)로 제한됩니다
+_LIST_PAGE_LIMIT = 500
 
-def _age(creation_timestamp: datetime | None) -> str:
+# Pod 로그 응답 바이트 상한 (tail_lines만으로는 초장문 라인을 막지 못함)
+_LOG_LIMIT_BYTES = 1_048_576
+
+# 컨테이너 재시작 횟수 추출자 (행마다 제너레이터 프레임을 만들지 않고
+# C 레벨 map+sum 경로를 타도록 모듈 상수로 고정)
+_RESTART_COUNT = operator.itemgetter("restartCount")
+
+# 테이블 헤더 (호출마다 재구성하지 않도록 모듈 상수로 고정)
+_POD_HEADER = f"{'NAME':<50} {'STATUS':<12} {'RESTARTS':<10} {'AGE':<8}\n" + "-" * 80 + "\n"
+_SVC_HEADER = f"{'NAME':<40} {'TYPE':<15} {'CLUSTER-IP':<18} {'PORTS':<30}\n" + "-" * 103 + "\n"
+_EVENT_HEADER = f"{'TYPE':<10} {'REASON':<20} {'OBJECT':<35} {'MESSAGE':<50}\n" + "-" * 115 + "\n"
+_DEP_HEADER = f"{'NAME':<45} {'READY':<10} {'REPLICAS':<10} {'AGE':<8}\n" + "-" * 73
+_CM_HEADER = f"{'NAME':<50} {'DATA KEYS':<12} {'AGE':<8}\n" + "-" * 70
+_SECRET_HEADER = f"{'NAME':<50} {'TYPE':<35} {'AGE':<8}\n" + "-" * 93
+
+
+def _list_all(list_fn: Any, **kwargs: Any) -> list[dict[str, Any]]:
+    """limit/continue 페이지네이션으로 리소스 전체를 원시 dict로 수집합니다.
+
+    한 번에 전체 컬렉션을 받는 대신 _LIST_PAGE_LIMIT 단위로 나눠 받아
+    apiserver와 클라이언트 양쪽의 피크 메모리를 제한합니다.
+
+    _preload_content=False로 생성 클라이언트의 OpenAPI 모델 역직렬화
+    (항목당 수십 번의 setattr/타입 변환)를 건너뛰고 orjson으로 바로
+    파싱합니다. 목록은 대여섯 개 필드만 읽으므로 원시 dict면 충분하고,
+    단건 get_*/read_* 호출은 필드 접근이 많아 타입 모델 경로를 유지합니다.
+
+    resourceVersion="0"(watch 캐시 응답)은 쓰지 않습니다: apiserver가
+    캐시에서 응답할 때는 limit을 무시하고 전체 컬렉션을 반환하므로
+    페이지네이션의 메모리 상한과 양립하지 않습니다. 첫 페이지는 기본
+    일관성(쿼럼 읽기)으로 받고, 이후 페이지는 continue 토큰이 스냅샷
+    일관성을 보장합니다.
+
+    Args:
+        list_fn: list_namespaced_* 형태의 클라이언트 메서드
+        **kwargs: list_fn에 전달할 추가 인자 (namespace 등)
+
+    Returns:
+        전 페이지의 item(원시 dict)을 합친 리스트
+    """
+    items: list[dict[str, Any]] = []
+    cont: str | None = None
+    while True:
+        if cont is None:
+            resp = list_fn(limit=_LIST_PAGE_LIMIT, _preload_content=False, **kwargs)
+        else:
+            resp = list_fn(limit=_LIST_PAGE_LIMIT, _continue=cont, _preload_content=False, **kwargs)
+        data = orjson.loads(resp.data)
+        items.extend(data["items"])
+        cont = (data.get("metadata") or {}).get("continue")
+        if not cont:
+            break
+    return items
+
+
+@functools.lru_cache(maxsize=1)
+def _get_api_client(context: str) -> client.ApiClient:
+    """설정 로드와 ApiClient 생성을 프로세스당 한 번만 수행합니다.
+
+    KubernetesOps가 여러 번 생성되어도 같은 ApiClient(keep-alive 커넥션
+    풀과 TLS 세션 포함)를 공유하므로, 재생성 시 TLS 핸드셰이크를 다시
+    하지 않습니다.
+
+    Args:
+        context: kubeconfig 컨텍스트 (빈 문자열이면 현재 컨텍스트 사용)
+
+    Returns:
+        설정이 적용된 공용 ApiClient
+    """
+    api_client: client.ApiClient
+
+    try:
+        # In-cluster: 명시적 Configuration 객체에 로드하여 글로벌 상태 격리
+        incluster_cfg = client.Configuration()
+        config.load_incluster_config(client_configuration=incluster_cfg)
+        incluster_cfg.connection_pool_maxsize = _CONNECTION_POOL_SIZE
+        api_client = client.ApiClient(configuration=incluster_cfg)
+        logger.info("In-cluster Kubernetes 설정 로드 완료")
+    except config.ConfigException:
+        try:
+            # Kubeconfig: new_client_from_config는 글로벌 상태를 변경하지 않음
+            api_client = config.new_client_from_config(context=context or None)
+            api_client.configuration.connection_pool_maxsize = _CONNECTION_POOL_SIZE
+            logger.info("Kubeconfig 설정 로드 완료")
+        except config.ConfigException as exc:
+            logger.warning("Kubernetes 설정 로드 실패: %s", exc)
+            api_client = client.ApiClient()
+
+    return api_client
+
+
+def _age(creation_timestamp: datetime | None, now_ts: float | None = None) -> str:
     """리소스 생성 시간을 사람이 읽기 쉬운 형식으로 변환합니다.
 
+    datetime 산술 객체 생성 없이 에포크 초 정수 divmod로 계산합니다.
+    목록 루프에서는 now_ts를 한 번만 구해 행마다 전달하세요.
+
     Args:
         creation_timestamp: 리소스 생성 시간 (UTC)
+        now_ts: 현재 시각 에포크 초 (없으면 time.time() 호출)
 
     Returns:
         "3d", "5h", "30m" 등의 문자열
     """
     if creation_timestamp is None:
         return "unknown"
-    now = datetime.now(UTC)
-    delta = now - creation_timestamp.replace(tzinfo=UTC)
-    days = delta.days
-    hours = delta.seconds // 3600
-    minutes = (delta.seconds % 3600) // 60
+    if now_ts is None:
+        now_ts = time.time()
+    seconds = int(now_ts - creation_timestamp.replace(tzinfo=UTC).timestamp())
+    days, rem = divmod(seconds, 86400)
     if days > 0:
         return f"{days}d"
+    hours, rem = divmod(rem, 3600)
     if hours > 0:
         return f"{hours}h"
-    return f"{minutes}m"
+    return f"{rem // 60}m"
+
+
+def _age_iso(iso: str | None, now_ts: float) -> str:
+    """RFC3339 타임스탬프 문자열을 수명 문자열로 변환합니다.
+
+    원시 dict 목록 경로용: creationTimestamp가 문자열로 도착하므로
+    datetime 모델을 거치지 않고 바로 파싱합니다.
+
+    Args:
+        iso: "2024-01-01T00:00:00Z" 형식 문자열 (없으면 "unknown")
+        now_ts: 현재 시각 에포크 초
+
+    Returns:
+        "3d", "5h", "30m" 등의 문자열
+    """
+    if not iso:
+        return "unknown"
+    return _age(datetime.fromisoformat(iso), now_ts)
 
 
 def _safe_name(obj: Any) -> str:
@@ -58,30 +183,14 @@ class KubernetesOps:
 
         클러스터 내부 환경(in-cluster)을 먼저 시도하고,
         실패하면 로컬 kubeconfig를 사용합니다.
-        명시적 ApiClient를 생성하여 글로벌 설정 오염을 최소화합니다.
+        ApiClient는 프로세스 공용 캐시(_get_api_client)에서 가져옵니다.
 
         Args:
             namespace: 기본 작업 네임스페이스
             context: kubeconfig 컨텍스트 (빈 문자열이면 현재 컨텍스트 사용)
         """
         self.namespace = namespace
-        api_client: client.ApiClient
-
-        try:
-            # In-cluster: 명시적 Configuration 객체에 로드하여 글로벌 상태 격리
-            incluster_cfg = client.Configuration()
-            config.load_incluster_config(client_configuration=incluster_cfg)
-            api_client = client.ApiClient(configuration=incluster_cfg)
-            logger.info("In-cluster Kubernetes 설정 로드 완료")
-        except config.ConfigException:
-            try:
-                # Kubeconfig: new_client_from_config는 글로벌 상태를 변경하지 않음
-                api_client = config.new_client_from_config(context=context or None)
-                logger.info("Kubeconfig 설정 로드 완료")
-            except config.ConfigException as exc:
-                logger.warning("Kubernetes 설정 로드 실패: %s", exc)
-                api_client = client.ApiClient()
-
+        api_client = _get_api_client(context)
         self._core = client.CoreV1Api(api_client=api_client)
         self._apps = client.AppsV1Api(api_client=api_client)
 
@@ -92,22 +201,35 @@ class KubernetesOps:
             Pod 이름, 상태, 재시작 횟수, 수명이 포함된 테이블 문자열
         """
         try:
-            pods = self._core.list_namespaced_pod(namespace=self.namespace)
-            if not pods.items:
+            pods = _list_all(self._core.list_namespaced_pod, namespace=self.namespace)
+            if not pods:
                 return f"네임스페이스 '{self.namespace}'에 Pod가 없습니다."
 
-            lines = [f"{'NAME':<50} {'STATUS':<12} {'RESTARTS':<10} {'AGE':<8}"]
-            lines.append("-" * 80)
-            for pod in pods.items:
-                name = _safe_name(pod)
-                phase = pod.status.phase if pod.status else "Unknown"
-                restarts = 0
-                if pod.status and pod.status.container_statuses:
-                    restarts = sum(cs.restart_count for cs in pod.status.container_statuses)
-                age = _age(pod.metadata.creation_timestamp if pod.metadata else None)
-                lines.append(f"{name:<50} {phase:<12} {restarts:<10} {age:<8}")
-
-            return "\n".join(lines)
+            # 추출 패스: 무거운 AoS 모델 객체에서 필요한 4개 필드만
+            # 평행 리스트(SoA)로 뽑아낸 뒤, 포매팅 루프는 zip 위에서만 돕니다.
+            # (행당 pod.status.* 식의 중첩 속성 조회를 한 번으로 줄임)
+            now_ts = time.time()
+            names: list[str] = []
+            phases: list[str] = []
+            restarts_col: list[int] = []
+            ages: list[str] = []
+            for pod in pods:
+                meta = pod.get("metadata") or {}
+                names.append(meta.get("name", "unknown"))
+                st = pod.get("status") or {}
+                phases.append(st.get("phase", "Unknown"))
+                cs = st.get("containerStatuses")
+                restarts_col.append(sum(map(_RESTART_COUNT, cs)) if cs else 0)
+                ages.append(_age_iso(meta.get("creationTimestamp"), now_ts))
+
+            # list[str] 누적 대신 StringIO 버퍼에 바로 기록 (행당 중간 리스트 제거)
+            buf = io.StringIO()
+            write = buf.write
+            write(_POD_HEADER)
+            for name, phase, restarts, age in zip(names, phases, restarts_col, ages):
+                write(f"{name:<50} {phase:<12} {restarts:<10} {age:<8}\n")
+
+            return buf.getvalue().rstrip("\n")
         except ApiException as exc:
             return f"Pod 목록 조회 실패: {exc.reason} (HTTP {exc.status})"
         except Exception as exc:
@@ -177,11 +299,28 @@ class KubernetesOps:
                 "name": name,
                 "namespace": self.namespace,
                 "tail_lines": tail,
+                # 본문을 한 덩어리 str로 선조립하지 않고 urllib3 응답을 직접 받아
+                # 8KB 청크 단위로 수신-디코딩을 겹칩니다 (메모리·TTFB 개선)
+                "_preload_content": False,
+                # tail_lines와 별개로 바이트 기준 상한 (초장문 라인 방어)
+                "limit_bytes": _LOG_LIMIT_BYTES,
             }
             if container:
                 kwargs["container"] = container
 
-            logs = self._core.read_namespaced_pod_log(**kwargs)
+            resp = self._core.read_namespaced_pod_log(**kwargs)
+            buf = io.StringIO()
+            # 청크 경계에서 잘린 멀티바이트 문자를 다음 청크와 이어 붙이도록
+            # 증분 디코더를 사용합니다 (청크별 str.decode는 U+FFFD로 깨짐)
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            try:
+                for chunk in resp.stream(8192):
+                    buf.write(decoder.decode(chunk))
+                buf.write(decoder.decode(b"", final=True))
+            finally:
+                resp.release_conn()
+
+            logs = buf.getvalue()
             if not logs:
                 return f"Pod '{name}'의 로그가 비어있습니다."
             return f"--- Pod '{name}' logs (last {tail} lines) ---\n{logs}"
@@ -197,17 +336,18 @@ class KubernetesOps:
             Deployment 이름, Ready 레플리카, 전체 레플리카, 수명이 포함된 테이블 문자열
         """
         try:
-            deps = self._apps.list_namespaced_deployment(namespace=self.namespace)
-            if not deps.items:
+            deps = _list_all(self._apps.list_namespaced_deployment, namespace=self.namespace)
+            if not deps:
                 return f"네임스페이스 '{self.namespace}'에 Deployment가 없습니다."
 
-            lines = [f"{'NAME':<45} {'READY':<10} {'REPLICAS':<10} {'AGE':<8}"]
-            lines.append("-" * 73)
-            for dep in deps.items:
-                name = _safe_name(dep)
-                ready = dep.status.ready_replicas or 0 if dep.status else 0
-                replicas = dep.spec.replicas or 0 if dep.spec else 0
-                age = _age(dep.metadata.creation_timestamp if dep.metadata else None)
+            now_ts = time.time()
+            lines = [_DEP_HEADER]
+            for dep in deps:
+                meta = dep.get("metadata") or {}
+                name = meta.get("name", "unknown")
+                ready = (dep.get("status") or {}).get("readyReplicas") or 0
+                replicas = (dep.get("spec") or {}).get("replicas") or 0
+                age = _age_iso(meta.get("creationTimestamp"), now_ts)
                 lines.append(f"{name:<45} {ready:<10} {replicas:<10} {age:<8}")
 
             return "\n".join(lines)
@@ -322,22 +462,24 @@ class KubernetesOps:
             Service 이름, 타입, ClusterIP, 포트가 포함된 테이블 문자열
         """
         try:
-            svcs = self._core.list_namespaced_service(namespace=self.namespace)
-            if not svcs.items:
+            svcs = _list_all(self._core.list_namespaced_service, namespace=self.namespace)
+            if not svcs:
                 return f"네임스페이스 '{self.namespace}'에 Service가 없습니다."
 
-            lines = [f"{'NAME':<40} {'TYPE':<15} {'CLUSTER-IP':<18} {'PORTS':<30}"]
-            lines.append("-" * 103)
-            for svc in svcs.items:
-                name = _safe_name(svc)
-                svc_type = svc.spec.type if svc.spec else "Unknown"
-                cluster_ip = svc.spec.cluster_ip if svc.spec else "None"
+            buf = io.StringIO()
+            write = buf.write
+            write(_SVC_HEADER)
+            for svc in svcs:
+                name = (svc.get("metadata") or {}).get("name", "unknown")
+                spec = svc.get("spec") or {}
+                svc_type = spec.get("type", "Unknown")
+                cluster_ip = spec.get("clusterIP", "None")
                 ports = ""
-                if svc.spec and svc.spec.ports:
-                    ports = ", ".join(f"{p.port}/{p.protocol or 'TCP'}" for p in svc.spec.ports)
-                lines.append(f"{name:<40} {svc_type:<15} {cluster_ip:<18} {ports:<30}")
+                if spec.get("ports"):
+                    ports = ", ".join(f"{p['port']}/{p.get('protocol', 'TCP')}" for p in spec["ports"])
+                write(f"{name:<40} {svc_type:<15} {cluster_ip:<18} {ports:<30}\n")
 
-            return "\n".join(lines)
+            return buf.getvalue().rstrip("\n")
         except ApiException as exc:
             return f"Service 목록 조회 실패: {exc.reason} (HTTP {exc.status})"
         except Exception as exc:
@@ -350,16 +492,17 @@ class KubernetesOps:
             ConfigMap 이름, 데이터 키 수, 수명이 포함된 테이블 문자열
         """
         try:
-            cms = self._core.list_namespaced_config_map(namespace=self.namespace)
-            if not cms.items:
+            cms = _list_all(self._core.list_namespaced_config_map, namespace=self.namespace)
+            if not cms:
                 return f"네임스페이스 '{self.namespace}'에 ConfigMap이 없습니다."
 
-            lines = [f"{'NAME':<50} {'DATA KEYS':<12} {'AGE':<8}"]
-            lines.append("-" * 70)
-            for cm in cms.items:
-                name = _safe_name(cm)
-                data_count = len(cm.data) if cm.data else 0
-                age = _age(cm.metadata.creation_timestamp if cm.metadata else None)
+            now_ts = time.time()
+            lines = [_CM_HEADER]
+            for cm in cms:
+                meta = cm.get("metadata") or {}
+                name = meta.get("name", "unknown")
+                data_count = len(cm.get("data") or {})
+                age = _age_iso(meta.get("creationTimestamp"), now_ts)
                 lines.append(f"{name:<50} {data_count:<12} {age:<8}")
 
             return "\n".join(lines)
@@ -408,16 +551,17 @@ class KubernetesOps:
             Secret 이름, 타입, 수명이 포함된 테이블 문자열
         """
         try:
-            secrets = self._core.list_namespaced_secret(namespace=self.namespace)
-            if not secrets.items:
+            secrets = _list_all(self._core.list_namespaced_secret, namespace=self.namespace)
+            if not secrets:
                 return f"네임스페이스 '{self.namespace}'에 Secret이 없습니다."
 
-            lines = [f"{'NAME':<50} {'TYPE':<35} {'AGE':<8}"]
-            lines.append("-" * 93)
-            for secret in secrets.items:
-                name = _safe_name(secret)
-                secret_type = secret.type or "Opaque"
-                age = _age(secret.metadata.creation_timestamp if secret.metadata else None)
+            now_ts = time.time()
+            lines = [_SECRET_HEADER]
+            for secret in secrets:
+                meta = secret.get("metadata") or {}
+                name = meta.get("name", "unknown")
+                secret_type = secret.get("type") or "Opaque"
+                age = _age_iso(meta.get("creationTimestamp"), now_ts)
                 lines.append(f"{name:<50} {secret_type:<35} {age:<8}")
 
             return "\n".join(lines)
@@ -436,34 +580,92 @@ class KubernetesOps:
             최근 이벤트 목록 문자열
         """
         try:
-            events = self._core.list_namespaced_event(namespace=self.namespace)
-            if not events.items:
+            # 전체 컬렉션 대신 서버 측에서 limit개만 받아 전송 바이트를 제한하고,
+            # 모델 역직렬화 없이 orjson으로 바로 파싱합니다.
+            resp = self._core.list_namespaced_event(
+                namespace=self.namespace, limit=limit, _preload_content=False
+            )
+            events = orjson.loads(resp.data).get("items") or []
+            if not events:
                 return f"네임스페이스 '{self.namespace}'에 이벤트가 없습니다."
 
-            # 최신 이벤트가 먼저 오도록 정렬
-            sorted_events = sorted(
-                events.items,
-                key=lambda e: e.last_timestamp
-                or e.metadata.creation_timestamp
-                or datetime.min.replace(tzinfo=UTC),
-                reverse=True,
-            )[:limit]
-
-            lines = [f"{'TYPE':<10} {'REASON':<20} {'OBJECT':<35} {'MESSAGE':<50}"]
-            lines.append("-" * 115)
+            # 받은 페이지 안에서만 최신 limit개를 부분 정렬로 추립니다.
+            # RFC3339 문자열은 사전순 == 시간순이므로 파싱 없이 비교합니다.
+            sorted_events = heapq.nlargest(
+                limit,
+                events,
+                key=lambda e: e.get("lastTimestamp")
+                or (e.get("metadata") or {}).get("creationTimestamp")
+                or "",
+            )
+
+            buf = io.StringIO()
+            write = buf.write
+            write(_EVENT_HEADER)
             for event in sorted_events:
-                event_type = event.type or "Normal"
-                reason = event.reason or ""
+                event_type = event.get("type") or "Normal"
+                reason = event.get("reason") or ""
                 obj = ""
-                if event.involved_object:
-                    kind = event.involved_object.kind or ""
-                    obj_name = event.involved_object.name or ""
-                    obj = f"{kind}/{obj_name}"
-                message = (event.message or "")[:50]
-                lines.append(f"{event_type:<10} {reason:<20} {obj:<35} {message:<50}")
+                if involved := event.get("involvedObject"):
+                    obj = f"{involved.get('kind', '')}/{involved.get('name', '')}"
+                message = (event.get("message") or "")[:50]
+                write(f"{event_type:<10} {reason:<20} {obj:<35} {message:<50}\n")
 
-            return "\n".join(lines)
+            return buf.getvalue().rstrip("\n")
         except ApiException as exc:
             return f"이벤트 조회 실패: {exc.reason} (HTTP {exc.status})"
         except Exception as exc:
             return f"이벤트 조회 중 오류: {exc}"
+
+    # ---- 비동기 래퍼 (블로킹 HTTPS 호출을 워커 스레드로 오프로드) ----
+    # asyncio.gather로 묶으면 독립적인 조회 N건이 sum(RTT)이 아닌
+    # max(RTT)에 끝납니다. 커넥션 풀은 공용 ApiClient가 공유합니다.
+
+    async def alist_pods(self) -> str:
+        """list_pods의 비동기 버전."""
+        return await asyncio.to_thread(self.list_pods)
+
+    async def alist_deployments(self) -> str:
+        """list_deployments의 비동기 버전."""
+        return await asyncio.to_thread(self.list_deployments)
+
+    async def alist_services(self) -> str:
+        """list_services의 비동기 버전."""
+        return await asyncio.to_thread(self.list_services)
+
+    async def alist_configmaps(self) -> str:
+        """list_configmaps의 비동기 버전."""
+        return await asyncio.to_thread(self.list_configmaps)
+
+    async def alist_secrets(self) -> str:
+        """list_secrets의 비동기 버전."""
+        return await asyncio.to_thread(self.list_secrets)
+
+    async def aget_events(self, limit: int = 20) -> str:
+        """get_events의 비동기 버전."""
+        return await asyncio.to_thread(self.get_events, limit)
+
+    async def get_pods_bulk(self, names: list[str]) -> str:
+        """여러 Pod의 상세 정보를 동시에 조회합니다.
+
+        직렬 get_pod N회(sum(RTT)) 대신 세마포어로 동시성을 8로 제한한
+        팬아웃으로 조회하여 max(RTT) 수준에 끝납니다. 결과는 입력 순서대로
+        이어 붙여 반환합니다.
+
+        Args:
+            names: 조회할 Pod 이름 리스트
+
+        Returns:
+            Pod별 상세 정보를 구분선으로 이어 붙인 문자열
+        """
+        if not names:
+            return "조회할 Pod 이름이 없습니다."
+
+        sem = asyncio.Semaphore(8)
+
+        async def one(name: str) -> str:
+            async with sem:
+                return await asyncio.to_thread(self.get_pod, name)
+
+        results = await asyncio.gather(*(one(n) for n in names))
+        return "\n\n".join(results)
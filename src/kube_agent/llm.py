@@ -6,14 +6,21 @@ vLLM/LiteLLM 등 OpenAI 호환 API를 통해 LLM과 통신합니다.
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable, Sequence
 from typing import Any
 
+import httpx
 from openai import AsyncOpenAI
 
 from kube_agent.config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
+# LLM 요청 타임아웃. 공유 httpx 클라이언트의 기본 타임아웃(Gitea 기준,
+# 기본 30초)을 SDK가 그대로 물려받으면 긴 생성/프리필이 끊기므로,
+# AsyncOpenAI에 명시적으로 넉넉한 값을 줘서 Gitea 설정과 분리합니다.
+_LLM_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
 # 시스템 프롬프트: 에이전트의 역할과 행동 지침을 정의 (자율 실행 모드)
 SYSTEM_PROMPT = (
     "You are kube-agent, an autonomous AI assistant for managing Kubernetes clusters "
@@ -53,29 +60,66 @@ class LLMClient:
     채팅 완성 요청(tool calling 포함)을 처리합니다.
     """
 
-    def __init__(self, config: AgentConfig) -> None:
+    def __init__(self, config: AgentConfig, client: httpx.AsyncClient | None = None) -> None:
         """LLM 클라이언트를 초기화합니다.
 
         Args:
             config: LLM 연결 정보가 포함된 에이전트 설정
+            client: 공유할 httpx.AsyncClient (없으면 HTTP/2 클라이언트를 자체 생성)
         """
+        if client is None:
+            # 주입받지 못한 경우에도 SDK 기본(HTTP/1.1, 호출별 커넥션 설정)
+            # 대신 keep-alive + HTTP/2 클라이언트를 직접 만들어 씁니다.
+            client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60.0),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+            self._owns_client = True
+        else:
+            self._owns_client = False
+        self._http = client
         self._client = AsyncOpenAI(
             base_url=config.llm_base_url,
             api_key=config.llm_api_key,
+            http_client=client,
+            timeout=_LLM_TIMEOUT,
         )
         self._model = config.llm_model
         self._verbose = config.verbose
+        # set_tools()로 등록된 세션 고정 도구 스키마 (매 호출마다 재전달 불필요)
+        self._tools: Sequence[dict[str, Any]] | None = None
+
+    def set_tools(self, tools: Sequence[dict[str, Any]] | None) -> None:
+        """세션 동안 사용할 도구 스키마를 한 번만 등록합니다.
+
+        도구 스키마는 세션 내내 변하지 않으므로, 호출마다 tools 인자를
+        넘기는 대신 여기서 등록해 두면 chat()/chat_stream()이 재사용합니다.
+        동일 객체를 재사용하면 프록시(LiteLLM 등)의 프롬프트 캐싱에도 유리합니다.
+
+        Args:
+            tools: OpenAI 형식의 도구 정의 리스트 (None이면 해제)
+        """
+        self._tools = tools
+
+    async def close(self) -> None:
+        """자체 생성한 HTTP 클라이언트를 정리합니다.
+
+        외부에서 주입받은 클라이언트는 소유자가 닫습니다.
+        """
+        if self._owns_client:
+            await self._http.aclose()
 
     async def chat(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
+        tools: Sequence[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         """LLM에 채팅 완성 요청을 보냅니다.
 
         Args:
             messages: OpenAI 형식의 메시지 리스트 (role, content 포함)
-            tools: OpenAI 형식의 도구 정의 리스트 (선택)
+            tools: OpenAI 형식의 도구 정의 리스트 (생략 시 set_tools 등록분 사용)
 
         Returns:
             응답 메시지 딕셔너리. 키:
@@ -87,6 +131,8 @@ class LLMClient:
             예외 발생 시 에러 메시지를 content에 담아 반환합니다.
         """
         try:
+            if tools is None:
+                tools = self._tools
             kwargs: dict[str, Any] = {
                 "model": self._model,
                 "messages": messages,
@@ -138,3 +184,87 @@ class LLMClient:
                 "role": "assistant",
                 "content": f"LLM API 호출 중 오류가 발생했습니다: {exc}",
             }
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Sequence[dict[str, Any]] | None = None,
+        on_content: Callable[[str], None] | None = None,
+    ) -> dict[str, Any]:
+        """스트리밍 모드로 채팅 완성 요청을 보냅니다.
+
+        텍스트 델타가 도착할 때마다 on_content 콜백을 호출하여
+        전체 응답 생성을 기다리지 않고 점진적으로 렌더링할 수 있습니다.
+        tool_calls 델타는 내부적으로 조립하여 chat()과 동일한 형식으로 반환합니다.
+
+        Args:
+            messages: OpenAI 형식의 메시지 리스트 (role, content 포함)
+            tools: OpenAI 형식의 도구 정의 리스트 (생략 시 set_tools 등록분 사용)
+            on_content: 텍스트 델타마다 호출되는 콜백 (선택)
+
+        Returns:
+            chat()과 동일한 형식의 응답 메시지 딕셔너리
+        """
+        try:
+            if tools is None:
+                tools = self._tools
+            kwargs: dict[str, Any] = {
+                "model": self._model,
+                "messages": messages,
+                "stream": True,
+            }
+            if tools:
+                kwargs["tools"] = tools
+                kwargs["tool_choice"] = "auto"
+
+            if self._verbose:
+                logger.debug(
+                    "LLM stream request: model=%s, messages=%d, tools=%d", self._model, len(messages), len(tools or [])
+                )
+
+            stream = await self._client.chat.completions.create(**kwargs)
+
+            content_parts: list[str] = []
+            # 스트림에서 tool_call은 index 기준 델타로 쪼개져 도착하므로 조립 필요
+            tool_calls: dict[int, dict[str, Any]] = {}
+
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta is None:
+                    continue
+
+                if delta.content:
+                    content_parts.append(delta.content)
+                    if on_content is not None:
+                        on_content(delta.content)
+
+                for tc in delta.tool_calls or []:
+                    entry = tool_calls.setdefault(
+                        tc.index,
+                        {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                    )
+                    if tc.id:
+                        entry["id"] = tc.id
+                    if tc.function:
+                        if tc.function.name:
+                            entry["function"]["name"] += tc.function.name
+                        if tc.function.arguments:
+                            entry["function"]["arguments"] += tc.function.arguments
+
+            result: dict[str, Any] = {
+                "role": "assistant",
+                "content": "".join(content_parts),
+            }
+            if tool_calls:
+                result["tool_calls"] = [tool_calls[i] for i in sorted(tool_calls)]
+
+            return result
+
+        except Exception as exc:
+            logger.error("LLM API 스트리밍 호출 실패: %s", exc)
+            return {
+                "role": "assistant",
+                "content": f"LLM API 호출 중 오류가 발생했습니다: {exc}",
+            }
@@ -14,6 +14,15 @@ import click
 from kube_agent.agent import Agent
 from kube_agent.config import AgentConfig
 
+# 에이전트는 전부 I/O 바운드(LLM/K8s/Gitea HTTP)이므로 libuv 기반
+# 이벤트 루프를 전역 정책으로 설치합니다. (미지원 플랫폼에서는 기본 루프 사용)
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
+
 
 def _setup_logging(verbose: bool) -> None:
     """로깅을 설정합니다.
@@ -7,8 +7,15 @@ OpenAI 형식의 도구(tool) 정의와 실행 디스패처를 제공합니다.
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from typing import Any, Callable
+import sys
+from collections.abc import Callable
+from typing import Any, Final
+
+import fastjsonschema
+import orjson
+from cachetools import TTLCache
 
 from kube_agent.file_ops import FileOps
 from kube_agent.gitea_ops import GiteaOps
@@ -30,8 +37,14 @@ def _register(name: str) -> Callable:
     return decorator
 
 
-# OpenAI function calling 형식의 도구 정의 목록
-TOOLS: list[dict[str, Any]] = [
+# 여러 도구가 공유하는 동일 스키마 조각 — 같은 dict 객체를 재사용해
+# 임포트 시 할당 수를 줄입니다 (직렬화 결과는 동일).
+_OWNER_PROP = {"type": "string", "description": "Repository owner username."}
+_REPO_PROP = {"type": "string", "description": "Repository name."}
+_GIT_PATH_PROP = {"type": "string", "description": "Path to the local Git repository."}
+
+# OpenAI function calling 형식의 도구 정의 목록 (세션 동안 불변이므로 튜플로 고정)
+TOOLS: Final[tuple[dict[str, Any], ...]] = (
     # ---- Kubernetes 도구 ----
     {
         "type": "function",
@@ -62,6 +75,24 @@ TOOLS: list[dict[str, Any]] = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "k8s_get_pods",
+            "description": "Get detailed information about multiple pods at once (one call instead of N).",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Names of the pods to inspect.",
+                    },
+                },
+                "required": ["names"],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
@@ -84,6 +115,7 @@ TOOLS: list[dict[str, Any]] = [
                     },
                 },
                 "required": ["name"],
+                "additionalProperties": False,
             },
         },
     },
@@ -221,6 +253,7 @@ TOOLS: list[dict[str, Any]] = [
                     },
                 },
                 "required": [],
+                "additionalProperties": False,
             },
         },
     },
@@ -245,10 +278,7 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "owner": {
-                        "type": "string",
-                        "description": "Repository owner username.",
-                    },
+                    "owner": _OWNER_PROP,
                     "name": {
                         "type": "string",
                         "description": "Repository name.",
@@ -280,6 +310,7 @@ TOOLS: list[dict[str, Any]] = [
                     },
                 },
                 "required": ["name"],
+                "additionalProperties": False,
             },
         },
     },
@@ -291,10 +322,7 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "owner": {
-                        "type": "string",
-                        "description": "Repository owner username.",
-                    },
+                    "owner": _OWNER_PROP,
                     "name": {
                         "type": "string",
                         "description": "Repository name.",
@@ -312,14 +340,8 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "owner": {
-                        "type": "string",
-                        "description": "Repository owner username.",
-                    },
-                    "repo": {
-                        "type": "string",
-                        "description": "Repository name.",
-                    },
+                    "owner": _OWNER_PROP,
+                    "repo": _REPO_PROP,
                 },
                 "required": ["owner", "repo"],
             },
@@ -345,14 +367,8 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "owner": {
-                        "type": "string",
-                        "description": "Repository owner username.",
-                    },
-                    "repo": {
-                        "type": "string",
-                        "description": "Repository name.",
-                    },
+                    "owner": _OWNER_PROP,
+                    "repo": _REPO_PROP,
                     "target_url": {
                         "type": "string",
                         "description": "The URL the webhook should POST to.",
@@ -364,6 +380,7 @@ TOOLS: list[dict[str, Any]] = [
                     },
                 },
                 "required": ["owner", "repo", "target_url"],
+                "additionalProperties": False,
             },
         },
     },
@@ -375,14 +392,23 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "owner": {
-                        "type": "string",
-                        "description": "Repository owner username.",
-                    },
-                    "repo": {
-                        "type": "string",
-                        "description": "Repository name.",
-                    },
+                    "owner": _OWNER_PROP,
+                    "repo": _REPO_PROP,
+                },
+                "required": ["owner", "repo"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "gitea_repo_overview",
+            "description": "Get repository details, branches, and webhooks of a Gitea repository in one call.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "owner": _OWNER_PROP,
+                    "repo": _REPO_PROP,
                 },
                 "required": ["owner", "repo"],
             },
@@ -417,10 +443,7 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the local Git repository.",
-                    },
+                    "path": _GIT_PATH_PROP,
                 },
                 "required": ["path"],
             },
@@ -434,12 +457,15 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "path": {
+                    "path": _GIT_PATH_PROP,
+                    "mode": {
                         "type": "string",
-                        "description": "Path to the local Git repository.",
+                        "enum": ["full", "dirty"],
+                        "description": "'full' lists changed files; 'dirty' only checks if changes exist (faster).",
                     },
                 },
                 "required": ["path"],
+                "additionalProperties": False,
             },
         },
     },
@@ -451,10 +477,7 @@ TOOLS: list[dict[str, Any]] = [
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Path to the local Git repository.",
-                    },
+                    "path": _GIT_PATH_PROP,
                     "message": {
                         "type": "string",
                         "description": "Commit message.",
@@ -528,58 +551,135 @@ TOOLS: list[dict[str, Any]] = [
             },
         },
     },
-]
+)
+
+# 도구 이름을 인터닝해 동일 리터럴로 조회하는 레지스트리/검증기 dict가
+# 해시 비교 대신 포인터 비교 빠른 경로를 타게 합니다.
+for _tool in TOOLS:
+    _tool["function"]["name"] = sys.intern(_tool["function"]["name"])
+
+# 한 턴 안에서 같은 인자로 반복 호출해도 결과가 같은 읽기 전용 도구.
+# 이 이름들에 한해 execute_tool의 turn_cache 병합이 적용됩니다.
+READ_ONLY_TOOLS: frozenset[str] = frozenset(
+    name
+    for t in TOOLS
+    if (name := t["function"]["name"]).startswith(("k8s_list_", "k8s_get_", "gitea_list_", "gitea_get_"))
+) | {"gitea_repo_overview", "file_read", "file_list"}
+
+# 턴 사이에도 잠깐 유효한 목록 결과 캐시.
+# 클러스터·저장소 상태는 LLM 턴 지연(수 초)보다 느리게 변하므로,
+# 짧은 TTL로 연속된 대화 턴의 중복 list 호출이 apiserver/Gitea에
+# 다시 나가지 않게 합니다. 쓰기 도구가 실행되면 즉시 비웁니다.
+_LIST_CACHE_TOOLS: frozenset[str] = frozenset(
+    {
+        "k8s_list_pods",
+        "k8s_list_deployments",
+        "k8s_list_services",
+        "k8s_list_configmaps",
+        "k8s_list_secrets",
+        "gitea_list_repos",
+    }
+)
+_LIST_CACHE: TTLCache = TTLCache(maxsize=64, ttl=3.0)
+
+# 비정상적으로 큰 요청/결과에 대한 방어 상한.
+# tail은 apiserver와 메모리를, 결과 글자 수는 LLM 컨텍스트를 보호합니다.
+_MAX_TAIL = 5_000
+_MAX_RESULT_CHARS = 200_000
+
+# 미지 도구 응답 템플릿 (호출마다 f-string을 새로 조립하지 않도록 바인딩)
+_UNKNOWN_TMPL = "알 수 없는 도구: {}".format
+
+
+def clear_list_cache() -> None:
+    """턴 간 목록 TTL 캐시를 비웁니다.
+
+    쓰기 도구 실행 직후 execute_tool이 호출하며,
+    테스트에서 상태 격리를 위해 직접 호출할 수도 있습니다.
+    """
+    _LIST_CACHE.clear()
+
+
+# 임포트 시 한 번 직렬화해 둔 도구 스키마 JSON.
+# OpenAI SDK는 요청 본문을 자체 인코딩하므로 채팅 경로에는 끼워 넣을 수
+# 없지만, 스키마를 로깅·해시(캐시 키)·디버그 덤프할 때 매번 28개의
+# 중첩 dict를 다시 걷지 않도록 여기서 제공합니다.
+TOOLS_JSON: Final[bytes] = orjson.dumps(TOOLS)
+
+
+# 도구별 parameters 스키마를 임포트 시 한 번만 컴파일한 검증기 테이블.
+# LLM이 생성한 인자를 디스패치 전에 검증해 잘못된 호출이 Kubernetes/
+# Gitea 클라이언트까지 내려가 깊은 곳에서 KeyError로 터지지 않게 하고,
+# 호출마다 검증기를 재구성하는 비용을 없앱니다.
+_VALIDATORS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    t["function"]["name"]: fastjsonschema.compile(t["function"]["parameters"]) for t in TOOLS
+}
 
 
 # ---- Kubernetes 도구 핸들러 ----
+# kubernetes 클라이언트는 블로킹이므로 핸들러를 async로 감싸
+# asyncio.to_thread로 오프로드합니다. 한 턴에 여러 tool_calls가 오면
+# 이벤트 루프가 k8s 호출과 Gitea HTTP 호출을 겹쳐 실행할 수 있습니다.
+#
+# 선택 인자의 기본값은 Ops 메서드 시그니처가 단일 출처입니다.
+# **a로 그대로 전달하는 핸들러의 스키마는 additionalProperties: False로
+# 여분 키를 검증 단계에서 거릅니다 (LLM이 흘린 엉뚱한 인자가 TypeError
+# 대신 친절한 검증 오류 메시지가 되도록). 핸들러에는 기본값을 중복
+# 기재하지 않습니다.
 
 @_register("k8s_list_pods")
-def _k8s_list_pods(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.list_pods()
+async def _k8s_list_pods(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.list_pods)
 
 @_register("k8s_get_pod")
-def _k8s_get_pod(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.get_pod(name=a["name"])
+async def _k8s_get_pod(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.get_pod, name=a["name"])
+
+@_register("k8s_get_pods")
+async def _k8s_get_pods(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await k8s.get_pods_bulk(names=a["names"])
 
 @_register("k8s_get_pod_logs")
-def _k8s_get_pod_logs(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.get_pod_logs(name=a["name"], container=a.get("container"), tail=a.get("tail", 100))
+async def _k8s_get_pod_logs(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    if (tail := a.get("tail")) is not None and tail > _MAX_TAIL:
+        a = {**a, "tail": _MAX_TAIL}
+    return await asyncio.to_thread(k8s.get_pod_logs, **a)
 
 @_register("k8s_list_deployments")
-def _k8s_list_deployments(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.list_deployments()
+async def _k8s_list_deployments(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.list_deployments)
 
 @_register("k8s_get_deployment")
-def _k8s_get_deployment(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.get_deployment(name=a["name"])
+async def _k8s_get_deployment(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.get_deployment, name=a["name"])
 
 @_register("k8s_restart_deployment")
-def _k8s_restart_deployment(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.restart_deployment(name=a["name"])
+async def _k8s_restart_deployment(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.restart_deployment, name=a["name"])
 
 @_register("k8s_scale_deployment")
-def _k8s_scale_deployment(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.scale_deployment(name=a["name"], replicas=a["replicas"])
+async def _k8s_scale_deployment(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.scale_deployment, name=a["name"], replicas=a["replicas"])
 
 @_register("k8s_list_services")
-def _k8s_list_services(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.list_services()
+async def _k8s_list_services(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.list_services)
 
 @_register("k8s_list_configmaps")
-def _k8s_list_configmaps(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.list_configmaps()
+async def _k8s_list_configmaps(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.list_configmaps)
 
 @_register("k8s_get_configmap")
-def _k8s_get_configmap(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.get_configmap(name=a["name"])
+async def _k8s_get_configmap(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.get_configmap, name=a["name"])
 
 @_register("k8s_list_secrets")
-def _k8s_list_secrets(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.list_secrets()
+async def _k8s_list_secrets(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.list_secrets)
 
 @_register("k8s_get_events")
-def _k8s_get_events(a: dict, k8s: KubernetesOps, **_: Any) -> str:
-    return k8s.get_events(limit=a.get("limit", 20))
+async def _k8s_get_events(a: dict, k8s: KubernetesOps, **_: Any) -> str:
+    return await asyncio.to_thread(k8s.get_events, **a)
 
 
 # ---- Gitea 도구 핸들러 ----
@@ -594,7 +694,7 @@ async def _gitea_get_repo(a: dict, gitea: GiteaOps, **_: Any) -> str:
 
 @_register("gitea_create_repo")
 async def _gitea_create_repo(a: dict, gitea: GiteaOps, **_: Any) -> str:
-    return await gitea.create_repo(name=a["name"], description=a.get("description", ""), private=a.get("private", True))
+    return await gitea.create_repo(**a)
 
 @_register("gitea_delete_repo")
 async def _gitea_delete_repo(a: dict, gitea: GiteaOps, **_: Any) -> str:
@@ -610,12 +710,16 @@ async def _gitea_list_users(a: dict, gitea: GiteaOps, **_: Any) -> str:
 
 @_register("gitea_create_webhook")
 async def _gitea_create_webhook(a: dict, gitea: GiteaOps, **_: Any) -> str:
-    return await gitea.create_webhook(owner=a["owner"], repo=a["repo"], target_url=a["target_url"], events=a.get("events"))
+    return await gitea.create_webhook(**a)
 
 @_register("gitea_list_webhooks")
 async def _gitea_list_webhooks(a: dict, gitea: GiteaOps, **_: Any) -> str:
     return await gitea.list_webhooks(owner=a["owner"], repo=a["repo"])
 
+@_register("gitea_repo_overview")
+async def _gitea_repo_overview(a: dict, gitea: GiteaOps, **_: Any) -> str:
+    return await gitea.repo_overview(owner=a["owner"], repo=a["repo"])
+
 @_register("gitea_clone_repo")
 async def _gitea_clone_repo(a: dict, gitea: GiteaOps, **_: Any) -> str:
     return await gitea.git_clone(repo_url=a["repo_url"], path=a["path"])
@@ -626,7 +730,7 @@ async def _gitea_git_pull(a: dict, gitea: GiteaOps, **_: Any) -> str:
 
 @_register("gitea_git_status")
 async def _gitea_git_status(a: dict, gitea: GiteaOps, **_: Any) -> str:
-    return await gitea.git_status(path=a["path"])
+    return await gitea.git_status(**a)
 
 @_register("gitea_commit_and_push")
 async def _gitea_commit_and_push(a: dict, gitea: GiteaOps, **_: Any) -> str:
@@ -648,16 +752,75 @@ def _file_write(a: dict, files: FileOps, **_: Any) -> str:
     return files.write_file(path=a["path"], content=a["content"], create_dirs=a.get("create_dirs", False))
 
 
+def build_dispatch_table(
+    k8s: KubernetesOps,
+    gitea: GiteaOps,
+    files: FileOps,
+) -> dict[str, Callable[[dict[str, Any]], Any]]:
+    """ops 인스턴스를 미리 바인딩한 세션용 디스패치 테이블을 만듭니다.
+
+    k8s/gitea/files는 세션 동안 바뀌지 않으므로, 핸들러마다
+    functools.partial로 한 번만 바인딩해 두면 호출 경로에서 키워드 인자
+    전달과 partial 생성이 사라집니다. 에이전트가 시작 시 한 번 만들어
+    execute_tool의 table 인자로 넘깁니다.
+
+    Args:
+        k8s: Kubernetes 작업 인스턴스
+        gitea: Gitea 작업 인스턴스
+        files: 파일시스템 작업 인스턴스
+
+    Returns:
+        도구 이름 → 인자 dict만 받는 바인딩된 핸들러 딕셔너리
+    """
+    return {
+        name: functools.partial(handler, k8s=k8s, gitea=gitea, files=files)
+        for name, handler in _TOOL_REGISTRY.items()
+    }
+
+
+# ops 계층은 실패를 예외가 아닌 한국어 오류 문자열로 반환하므로,
+# 캐시에 저장하기 전에 흔한 실패 표기를 첫 줄에서 휴리스틱으로 거릅니다
+# (일시적 오류가 턴/TTL 캐시에 고정되는 것을 방지).
+_ERROR_MARKERS = ("실패:", "오류:")
+
+
+def _is_ops_error(result: str) -> bool:
+    """결과 문자열이 ops 계층의 오류 보고로 보이는지 판별합니다."""
+    head = result.partition("\n")[0]
+    return any(marker in head for marker in _ERROR_MARKERS)
+
+
+def _do_dispatch(
+    call: Callable[[dict[str, Any]], Any],
+    tool_name: str,
+    arguments: dict[str, Any],
+) -> Any:
+    """인자를 검증하고 바인딩된 핸들러를 호출합니다 (결과 또는 코루틴 반환).
+
+    execute_tool의 try 블록이 이 한 번의 호출만 감싸도록 분리해,
+    캐시 조회·결과 저장이 예외 엣지 없는 바깥 경로에서 실행되게 합니다.
+    """
+    validator = _VALIDATORS.get(tool_name)
+    if validator is not None:
+        validator(arguments)
+    return call(arguments)
+
+
 async def execute_tool(
     tool_name: str,
     arguments: dict[str, Any],
     k8s: KubernetesOps,
     gitea: GiteaOps,
     files: FileOps,
+    turn_cache: dict[tuple[str, bytes], str] | None = None,
+    table: dict[str, Callable[[dict[str, Any]], Any]] | None = None,
 ) -> str:
     """도구 이름에 따라 레지스트리에서 핸들러를 찾아 실행합니다.
 
     동기 핸들러(k8s, files)와 비동기 핸들러(gitea)를 통합 처리합니다.
+    turn_cache가 주어지면 READ_ONLY_TOOLS에 한해 같은 사용자 턴 안의 동일
+    호출을 재실행하지 않고 캐시된 결과를 반환합니다 (호출자가 사용자 턴마다
+    새 dict를 전달하고, 쓰기 도구 실행 시 여기서 비웁니다).
 
     Args:
         tool_name: 실행할 도구 이름 (예: k8s_list_pods, gitea_list_repos, file_read)
@@ -665,21 +828,55 @@ async def execute_tool(
         k8s: Kubernetes 작업 인스턴스
         gitea: Gitea 작업 인스턴스
         files: 파일시스템 작업 인스턴스
+        turn_cache: 턴 단위 읽기 전용 결과 캐시 (선택)
+        table: build_dispatch_table로 미리 바인딩한 테이블 (선택)
 
     Returns:
         도구 실행 결과 문자열
     """
-    handler = _TOOL_REGISTRY.get(tool_name)
-    if handler is None:
-        return f"알 수 없는 도구: {tool_name}"
+    if table is not None:
+        call = table.get(tool_name)
+    else:
+        handler = _TOOL_REGISTRY.get(tool_name)
+        call = None if handler is None else functools.partial(handler, k8s=k8s, gitea=gitea, files=files)
+    if call is None:
+        return _UNKNOWN_TMPL(tool_name)
+
+    cache_key: tuple[str, bytes] | None = None
+    if tool_name in READ_ONLY_TOOLS:
+        cache_key = (tool_name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS))
+        if turn_cache is not None and (cached := turn_cache.get(cache_key)) is not None:
+            return cached
+        if tool_name in _LIST_CACHE_TOOLS and (cached := _LIST_CACHE.get(cache_key)) is not None:
+            return cached
 
     try:
-        result = handler(arguments, k8s=k8s, gitea=gitea, files=files)
+        result = _do_dispatch(call, tool_name, arguments)
         if asyncio.iscoroutine(result):
-            return await result
-        return result
+            result = await result
+    except fastjsonschema.JsonSchemaException as exc:
+        return f"도구 '{tool_name}' 인자 검증 실패 — 필수 인자 누락 또는 형식 오류: {exc}"
     except KeyError as exc:
         return f"도구 '{tool_name}' 실행 시 필수 인자 누락: {exc}"
     except Exception as exc:
-        logger.error("도구 '%s' 실행 중 예외: %s", tool_name, exc)
+        logger.exception("도구 '%s' 실행 중 예외", tool_name)
         return f"도구 '{tool_name}' 실행 중 오류: {exc}"
+
+    # LLM 컨텍스트와 메모리를 보호하는 최종 크기 상한 (잘림을 명시해 재요청 유도)
+    if len(result) > _MAX_RESULT_CHARS:
+        result = result[:_MAX_RESULT_CHARS] + f"\n... (결과가 {_MAX_RESULT_CHARS:,}자 상한에서 잘렸습니다)"
+
+    if cache_key is not None:
+        # ops 오류 문자열은 캐시하지 않습니다 (일시 오류가 재시도를 막지 않도록)
+        if not _is_ops_error(result):
+            if turn_cache is not None:
+                turn_cache[cache_key] = result
+            if tool_name in _LIST_CACHE_TOOLS:
+                _LIST_CACHE[cache_key] = result
+    else:
+        # 쓰기 도구가 클러스터/저장소 상태를 바꿨을 수 있으므로
+        # 다음 읽기가 신선한 결과를 받도록 턴 캐시와 목록 캐시를 비웁니다.
+        if turn_cache is not None:
+            turn_cache.clear()
+        clear_list_cache()
+    return result
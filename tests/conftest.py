@@ -0,0 +1,22 @@
+"""테스트 공통 설정.
+
+테스트 모듈들은 서로 독립적이므로 pytest-xdist로 코어별 병렬 실행이
+가능합니다 (TOOLS/_TOOL_REGISTRY 등 공유 전역은 임포트 후 읽기 전용):
+
+    pytest -n auto --dist=loadfile
+
+loadfile 분배는 모듈 단위로 워커에 배정되므로, test_tools.py의
+모듈 스코프 autospec mock들이 워커 간에 섞이지 않습니다.
+"""
+
+import asyncio
+
+# uvloop이 설치돼 있으면 비동기 테스트를 C 구현 이벤트 루프에서 돌립니다
+# (세션 스코프 루프 설정과 결합되어 정책은 한 번만 적용됨). 선택 의존성이라
+# 없는 환경에서는 기본 selector 루프를 그대로 사용합니다.
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
@@ -3,101 +3,136 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import create_autospec
 
 import pytest
 
-from kube_agent.tools import TOOLS, _TOOL_REGISTRY, execute_tool
+from kube_agent.file_ops import FileOps
+from kube_agent.gitea_ops import GiteaOps
+from kube_agent.kubernetes_ops import KubernetesOps
+from kube_agent.tools import TOOLS, _TOOL_REGISTRY, clear_list_cache, execute_tool
+
+# TOOLS/_TOOL_REGISTRY는 임포트 후 불변이므로 이름 집합을 모듈에서 한 번만 계산
+_DEFINED_NAMES = frozenset(t["function"]["name"] for t in TOOLS)
+_REGISTERED_NAMES = frozenset(_TOOL_REGISTRY)
+
+
+@pytest.fixture(scope="session")
+def registry_diff() -> dict[str, frozenset[str]]:
+    """정의/등록 이름 집합의 차집합을 세션에서 한 번만 계산합니다."""
+    return {
+        "missing": _DEFINED_NAMES - _REGISTERED_NAMES,
+        "orphans": _REGISTERED_NAMES - _DEFINED_NAMES,
+    }
 
 
 class TestRegistry:
     """_TOOL_REGISTRY가 TOOLS 정의와 일치하는지 검증합니다."""
 
-    def test_all_tools_have_handlers(self) -> None:
+    def test_all_tools_have_handlers(self, registry_diff) -> None:
         """TOOLS에 정의된 모든 도구에 대해 핸들러가 등록되어 있어야 합니다."""
-        defined_names = {t["function"]["name"] for t in TOOLS}
-        registered_names = set(_TOOL_REGISTRY.keys())
-        missing = defined_names - registered_names
-        assert not missing, f"핸들러가 없는 도구: {missing}"
+        assert not registry_diff["missing"], f"핸들러가 없는 도구: {registry_diff['missing']}"
 
-    def test_no_orphan_handlers(self) -> None:
+    def test_no_orphan_handlers(self, registry_diff) -> None:
         """TOOLS에 정의되지 않은 핸들러가 없어야 합니다."""
-        defined_names = {t["function"]["name"] for t in TOOLS}
-        registered_names = set(_TOOL_REGISTRY.keys())
-        orphans = registered_names - defined_names
-        assert not orphans, f"TOOLS에 정의 없는 핸들러: {orphans}"
+        assert not registry_diff["orphans"], f"TOOLS에 정의 없는 핸들러: {registry_diff['orphans']}"
 
     def test_tool_count_matches(self) -> None:
         """등록된 핸들러 수와 TOOLS 정의 수가 일치해야 합니다."""
-        assert len(_TOOL_REGISTRY) == len(TOOLS)
+        assert len(_REGISTERED_NAMES) == len(_DEFINED_NAMES) == len(TOOLS)
+
+
+# mock 생성은 unittest.mock에서 가장 무거운 축에 속하므로 모듈에서 한 번만
+# 만들고, 테스트마다 reset_mock으로 초기화해 재사용합니다. autospec은 실제
+# 클래스 API 밖의 속성 접근(자식 mock 무한 증식)도 함께 차단합니다.
+_K8S = create_autospec(KubernetesOps, instance=True)
+_GITEA = create_autospec(GiteaOps, instance=True)
+_FILES = create_autospec(FileOps, instance=True)
+
+
+class _NoName(dict):
+    """'name' 조회 시 KeyError를 던지는 인자 딕셔너리.
+
+    required 키 집합 검사는 통과하되 실제 값 추출 경로에서 실패하도록
+    만들어, execute_tool의 KeyError 처리 분기를 mock 우회 없이 검증합니다.
+    """
+
+    def __getitem__(self, key):
+        if key == "name":
+            raise KeyError("name")
+        return super().__getitem__(key)
 
 
 class TestExecuteTool:
     """execute_tool의 디스패치 동작을 검증합니다."""
 
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        """공유 mock과 도구 목록 캐시를 테스트 간에 격리합니다."""
+        clear_list_cache()
+        _K8S.reset_mock(return_value=True, side_effect=True)
+        _GITEA.reset_mock(return_value=True, side_effect=True)
+        _FILES.reset_mock(return_value=True, side_effect=True)
+        yield
+
     @pytest.fixture
-    def mocks(self):
-        k8s = MagicMock()
-        gitea = MagicMock()
-        files = MagicMock()
-        return k8s, gitea, files
-
-    @pytest.mark.asyncio
-    async def test_unknown_tool_returns_error(self, mocks) -> None:
-        k8s, gitea, files = mocks
-        result = await execute_tool("no_such_tool", {}, k8s, gitea, files)
-        assert "알 수 없는 도구" in result
-
-    @pytest.mark.asyncio
-    async def test_k8s_list_pods_dispatched(self, mocks) -> None:
-        k8s, gitea, files = mocks
-        k8s.list_pods.return_value = "pod-list"
-        result = await execute_tool("k8s_list_pods", {}, k8s, gitea, files)
-        assert result == "pod-list"
-        k8s.list_pods.assert_called_once()
+    def k8s(self):
+        return _K8S
 
-    @pytest.mark.asyncio
-    async def test_k8s_get_pod_passes_name(self, mocks) -> None:
-        k8s, gitea, files = mocks
-        k8s.get_pod.return_value = "pod-detail"
-        result = await execute_tool("k8s_get_pod", {"name": "my-pod"}, k8s, gitea, files)
-        assert result == "pod-detail"
-        k8s.get_pod.assert_called_once_with(name="my-pod")
+    @pytest.fixture
+    def gitea(self):
+        return _GITEA
 
-    @pytest.mark.asyncio
-    async def test_gitea_async_handler(self, mocks) -> None:
-        """비동기 Gitea 핸들러가 올바르게 await되어야 합니다."""
-        k8s, gitea, files = mocks
-        gitea.list_repos = AsyncMock(return_value="repo-list")
-        result = await execute_tool("gitea_list_repos", {}, k8s, gitea, files)
-        assert result == "repo-list"
-        gitea.list_repos.assert_awaited_once()
+    @pytest.fixture
+    def files(self):
+        return _FILES
 
-    @pytest.mark.asyncio
-    async def test_missing_required_arg_returns_error(self, mocks) -> None:
-        """필수 인자 누락 시 에러 메시지를 반환해야 합니다."""
-        k8s, gitea, files = mocks
-        # k8s_get_pod는 'name' 필수
-        k8s.get_pod.side_effect = KeyError("name")
-        result = await execute_tool("k8s_get_pod", {}, k8s, gitea, files)
-        assert "필수 인자 누락" in result
-
-    @pytest.mark.asyncio
-    async def test_file_list_dispatched(self, mocks) -> None:
-        k8s, gitea, files = mocks
-        files.list_directory.return_value = "dir-listing"
-        result = await execute_tool("file_list", {"path": "/tmp/repo"}, k8s, gitea, files)
-        assert result == "dir-listing"
-        files.list_directory.assert_called_once_with(path="/tmp/repo", recursive=False)
+    # 기본 인자 바인딩으로 execute_tool을 LOAD_FAST로 조회합니다
+    # (케이스 루프에서 LOAD_GLOBAL 반복을 피함)
+    async def test_dispatch_cases(self, k8s, gitea, files, _execute=execute_tool) -> None:
+        """대표 도구 호출(성공/오류)을 한 이벤트 루프에서 일괄 실행해 검증합니다.
 
-    @pytest.mark.asyncio
-    async def test_file_write_with_create_dirs(self, mocks) -> None:
-        k8s, gitea, files = mocks
+        테스트별 이벤트 루프 생성·해제가 마이크로초급 코루틴 실행보다
+        비싸므로, 독립적인 케이스를 gather로 묶어 루프 한 번에 돌립니다.
+        """
+        k8s.list_pods.return_value = "pod-list"
+        k8s.get_pod.return_value = "pod-detail"
+        # autospec이 async 메서드를 AsyncMock으로 만들어 주므로 반환값만 지정
+        gitea.list_repos.return_value = "repo-list"
+        files.list_directory.return_value = "dir-listing"
         files.write_file.return_value = "파일 생성 완료"
-        result = await execute_tool(
-            "file_write",
-            {"path": "/tmp/f.txt", "content": "hello", "create_dirs": True},
-            k8s, gitea, files,
+
+        # (도구 이름, 인자, 기대값, 완전 일치 여부 — False면 포함 검사)
+        cases = [
+            ("k8s_list_pods", {}, "pod-list", True),
+            ("k8s_get_pod", {"name": "my-pod"}, "pod-detail", True),
+            ("gitea_list_repos", {}, "repo-list", True),
+            ("file_list", {"path": "/tmp/repo"}, "dir-listing", True),
+            (
+                "file_write",
+                {"path": "/tmp/f.txt", "content": "hello", "create_dirs": True},
+                "파일 생성 완료",
+                True,
+            ),
+            ("no_such_tool", {}, "알 수 없는 도구", False),
+            # k8s_get_pod는 'name' 필수 — 스키마 검증이 핸들러 전에 거릅니다
+            ("k8s_get_pod", {}, "필수 인자 누락", False),
+            # 키는 존재하지만 값 추출에서 KeyError가 나는 경로
+            ("k8s_get_pod", _NoName({"name": "x"}), "필수 인자 누락", False),
+        ]
+
+        results = await asyncio.gather(
+            *(_execute(name, args, k8s, gitea, files) for name, args, _, _ in cases)
         )
-        assert result == "파일 생성 완료"
+
+        for (name, _, expected, exact), result in zip(cases, results):
+            if exact:
+                assert result == expected, f"{name}: {result}"
+            else:
+                assert expected in result, f"{name}: {result}"
+
+        k8s.list_pods.assert_called_once()
+        k8s.get_pod.assert_called_once_with(name="my-pod")
+        gitea.list_repos.assert_awaited_once()
+        files.list_directory.assert_called_once_with(path="/tmp/repo", recursive=False)
         files.write_file.assert_called_once_with(path="/tmp/f.txt", content="hello", create_dirs=True)